@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from typing import Optional, List
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Employee, Survey, SurveyResponse, Question
 from app.config import settings
-# from app.bot.bot import bot
-# from app.bot.services.notification_service import NotificationService
+from app.services.assignments import eligible_employee_criteria, bulk_assign_survey, enqueue_survey_invites
+from app.services.reminders import schedule_reminders
+from app.bot.bot import bot
+from app.bot.services.notification_service import NotificationService
 
 router = APIRouter()
 
@@ -19,6 +21,11 @@ class InitiateSurveyRequest(BaseModel):
     survey_id: int
 
 
+class BulkInitiateSurveyRequest(BaseModel):
+    survey_id: int
+    send_invites: bool = True
+
+
 class WebhookResponse(BaseModel):
     status: str
 
@@ -99,6 +106,8 @@ async def initiate_survey(
         status="pending"
     )
     db.add(db_response)
+    await db.flush()
+    await schedule_reminders(db, [db_response.id])
     await db.commit()
     await db.refresh(db_response)
 
@@ -120,9 +129,57 @@ async def initiate_survey(
     }
 
 
+@router.post("/initiate-survey/bulk")
+async def initiate_survey_bulk(
+    request: BulkInitiateSurveyRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    HR assigns a survey to every eligible employee who does not have it yet.
+
+    Responses are created by one INSERT ... SELECT in a single transaction,
+    then invites are queued to the outbound sender in batches.
+    """
+    survey_result = await db.execute(
+        select(Survey).where(Survey.id == request.survey_id)
+    )
+    survey = survey_result.scalar_one_or_none()
+
+    if not survey:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+
+    if not survey.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Survey is not active"
+        )
+
+    criteria = eligible_employee_criteria(survey)
+    eligible_result = await db.execute(select(func.count(Employee.id)).where(*criteria))
+    eligible_count = eligible_result.scalar() or 0
+
+    employee_ids = await bulk_assign_survey(db, survey.id, *criteria)
+    await db.commit()
+
+    invites_queued = 0
+    if request.send_invites and employee_ids:
+        invites_queued = await enqueue_survey_invites(survey, employee_ids)
+
+    return {
+        "message": "Survey initiated successfully",
+        "survey_id": survey.id,
+        "eligible": eligible_count,
+        "created": len(employee_ids),
+        "already_assigned": eligible_count - len(employee_ids),
+        "invites_queued": invites_queued,
+    }
+
+
 # Инициализация сервиса уведомлений
-# notification_service = NotificationService(bot)
-notification_service = None
+notification_service = NotificationService(bot)
 
 
 @router.post("/send-invite")
@@ -152,105 +209,95 @@ async def send_survey_invite(
 @router.post("/send-reminder")
 async def send_survey_reminder(
     request: dict,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Отправка напоминания о прохождении опроса.
     """
-    return {"success": False, "error": "Bot disabled"}
-    # result = await notification_service.send_reminder(
-    #     employee_id=request["employee_id"],
-    #     survey_id=request["survey_id"],
-    #     db=db,
-    #     days_remaining=request.get("days_remaining")
-    # )
+    result = await notification_service.send_reminder(
+        employee_id=request["employee_id"],
+        survey_id=request["survey_id"],
+        db=db,
+        days_remaining=request.get("days_remaining")
+    )
 
-    # if not result["success"]:
-    #     raise HTTPException(
-    #         status_code=status.HTTP_400_BAD_REQUEST,
-    #         detail=result.get("error", "Failed to send reminder")
-    #     )
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.get("error", "Failed to send reminder")
+        )
 
-    # return result
+    return result
 
 
 @router.post("/send-reminders-batch")
 async def send_reminders_batch(
     request: dict,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Отправка серии напоминаний всем сотрудникам, у которых есть опрос.
     """
-    return {"success": False, "error": "Bot disabled"}
-    # result = await notification_service.send_multiple_reminders(
-    #     survey_id=request["survey_id"],
-    #     db=db,
-    #     days=request.get("days", [3, 1, 0])
-    # )
+    result = await notification_service.send_multiple_reminders(
+        survey_id=request["survey_id"],
+        db=db,
+        days=request.get("days", [3, 1, 0])
+    )
 
-    # if not result["success"]:
-    #     raise HTTPException(
-    #         status_code=status.HTTP_400_BAD_REQUEST,
-    #         detail=result.get("error", "Failed to send reminders")
-    #     )
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result.get("error", "Failed to send reminders")
+        )
 
-    # return result
+    return result
 
 
 @router.get("/surveys/{telegram_id}")
 async def get_user_surveys(
     telegram_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Получение списка доступных опросов для пользователя.
     """
     # Получаем сотрудника
     employee_result = await db.execute(
-        select(Employee).where(Employee.telegram_id == telegram_id)
+        select(Employee.id).where(Employee.telegram_id == telegram_id)
     )
-    employee = employee_result.scalar_one_or_none()
+    employee_id = employee_result.scalar_one_or_none()
 
-    if not employee:
+    if employee_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
 
-    # Получаем все активные опросы
-    surveys_result = await db.execute(
-        select(Survey).where(Survey.is_active == True)
+    # Активные опросы без ответа сотрудника (anti-join) с количеством вопросов
+    # одним запросом
+    has_response = (
+        select(SurveyResponse.id)
+        .where(
+            SurveyResponse.survey_id == Survey.id,
+            SurveyResponse.employee_id == employee_id
+        )
+        .exists()
     )
-    surveys = surveys_result.scalars().all()
-
-    # Фильтруем опросы, для которых еще нет ответа у сотрудника
-    available_surveys = []
-    for survey in surveys:
-        # Проверяем, есть ли уже ответ
-        existing_result = await db.execute(
-            select(SurveyResponse).where(
-                SurveyResponse.survey_id == survey.id,
-                SurveyResponse.employee_id == employee.id
-            )
+    surveys_result = await db.execute(
+        select(
+            Survey.id,
+            Survey.title,
+            Survey.description,
+            Survey.is_active,
+            Survey.days_after_start,
+            func.count(Question.id).label("questions_count"),
         )
-        existing = existing_result.scalar_one_or_none()
-
-        if not existing:
-            # Получаем количество вопросов
-            questions_result = await db.execute(
-                select(Question).where(Question.survey_id == survey.id)
-            )
-            questions = questions_result.scalars().all()
-
-            available_surveys.append({
-                "id": survey.id,
-                "title": survey.title,
-                "description": survey.description,
-                "is_active": survey.is_active,
-                "days_after_start": survey.days_after_start,
-                "questions_count": len(questions)
-            })
+        .outerjoin(Question, Question.survey_id == Survey.id)
+        .where(Survey.is_active == True, ~has_response)
+        .group_by(Survey.id)
+        .order_by(Survey.id)
+    )
+    available_surveys = [row._asdict() for row in surveys_result]
 
     return {
         "telegram_id": telegram_id,
@@ -262,7 +309,7 @@ async def get_user_surveys(
 @router.get("/eligible-employees/{survey_id}")
 async def get_eligible_employees(
     survey_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get list of employees eligible for a survey (90+ days after start)."""
     # Get survey
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, delete
+from typing import List, Optional
 from datetime import date
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Employee
+from app.services.fieldsets import parse_fields, fieldset_response
+from app.services.pagination import paginate, count_total, next_after_id
 from app.schemas import EmployeeCreate, EmployeeUpdate, Employee as EmployeeSchema, EmployeeList
 
 router = APIRouter()
@@ -15,21 +17,36 @@ router = APIRouter()
 async def get_employees(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    after_id: Optional[int] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get list of all employees."""
-    result = await db.execute(select(Employee).offset(skip).limit(limit))
+    """
+    Get list of all employees. Pass after_id (next_after_id of the previous page) for keyset pagination.
+
+    fields=id,first_name,... selects and returns only the listed columns.
+    """
+    selected = parse_fields(fields, EmployeeSchema.model_fields)
+    total = await count_total(db, Employee)
+
+    if selected is not None:
+        query = select(*(getattr(Employee, name) for name in selected))
+        result = await db.execute(paginate(query, Employee.id, skip, limit, after_id))
+        rows = result.all()
+        return fieldset_response({
+            "employees": [row._asdict() for row in rows],
+            "total": total,
+            "next_after_id": next_after_id(rows, limit),
+        })
+
+    result = await db.execute(paginate(select(Employee), Employee.id, skip, limit, after_id))
     employees = result.scalars().all()
 
-    # Get total count
-    count_result = await db.execute(select(Employee))
-    total = len(count_result.scalars().all())
-
-    return EmployeeList(employees=employees, total=total)
+    return EmployeeList(employees=employees, total=total, next_after_id=next_after_id(employees, limit))
 
 
 @router.get("/{employee_id}", response_model=EmployeeSchema)
-async def get_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
+async def get_employee(employee_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get employee by ID."""
     result = await db.execute(select(Employee).where(Employee.id == employee_id))
     employee = result.scalar_one_or_none()
@@ -92,24 +109,22 @@ async def update_employee(
 
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
-    """Delete employee."""
-    result = await db.execute(select(Employee).where(Employee.id == employee_id))
-    db_employee = result.scalar_one_or_none()
+    """Delete employee. Their responses and answers are removed by ON DELETE CASCADE."""
+    result = await db.execute(delete(Employee).where(Employee.id == employee_id))
 
-    if not db_employee:
+    if not result.rowcount:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
 
-    await db.delete(db_employee)
     await db.commit()
 
     return None
 
 
 @router.get("/telegram/{telegram_id}", response_model=EmployeeSchema)
-async def get_employee_by_telegram(telegram_id: int, db: AsyncSession = Depends(get_db)):
+async def get_employee_by_telegram(telegram_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get employee by Telegram ID."""
     result = await db.execute(select(Employee).where(Employee.telegram_id == telegram_id))
     employee = result.scalar_one_or_none()
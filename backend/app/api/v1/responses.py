@@ -1,59 +1,177 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import BinaryIO, List, Optional, Union
 from datetime import datetime
-from io import BytesIO
+import os
+
+from app.database import get_db, get_read_db, read_session
+from app.models import SurveyResponse, Answer, Survey, Employee
+from app.services.analytics import count_responses, load_question_analytics
+from app.services.csv_export import CSV_MEDIA_TYPE, GZIP_MEDIA_TYPE, iter_csv_chunks
+from app.services.excel_export import XLSX_MEDIA_TYPE
+from app.services.export_cache import export_cache
+from app.services.detach_jobs import DETACH_JOB, submit_detach_job
+from app.services.export_jobs import EXPORT_JOB, open_cached_export, submit_export_job
+from app.services.jobs import JOB_COMPLETED, Job, jobs
+from app.services.versions import get_survey_data_version, get_survey_results_version
+from app.services.etags import make_etag, is_not_modified, set_etag, not_modified_response
+from app.services.fieldsets import parse_fields, fieldset_response
+from app.services.json_response import FastJSONResponse, render_json
+from app.services.singleflight import single_flight
+from app.services.pagination import paginate, count_total, next_after_id
+from app.services.read_models import (
+    build_employee_result,
+    build_response_fields,
+    build_response_result,
+    load_employee,
+    load_employee_responses,
+    load_survey_definition,
+    load_survey_definitions,
+    load_survey_responses,
+)
+from app.schemas import ResponseList, SurveyResults, ResponseResult, SurveyResponse as SurveyResponseSchema, SurveyAnalytics, QuestionAnalytics, ExportJob, DetachJob, ResponseSummaryList, SurveyResponseSummary
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+router = APIRouter()
 
-from app.database import get_db
-from app.models import SurveyResponse, Answer, Survey, Question, QuestionOption, Employee
-from app.schemas import ResponseList, SurveyResults, ResponseResult, QuestionResult, EmployeeResult, SurveyResponse as SurveyResponseSchema, SurveyAnalytics, QuestionAnalytics
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+async def _in_own_session(func, *args):
+    """Run func(db, *args) in a separate read session, as shared computations outlive the request."""
+    async with read_session() as db:
+        return await func(db, *args)
 
-router = APIRouter()
+
+def _response_columns(names):
+    """Column expressions for a response projection; answers_count is a correlated COUNT."""
+    columns = []
+    for name in names:
+        if name == "answers_count":
+            columns.append(
+                select(func.count(Answer.id))
+                .where(Answer.response_id == SurveyResponse.id)
+                .correlate(SurveyResponse)
+                .scalar_subquery()
+                .label("answers_count")
+            )
+        else:
+            columns.append(getattr(SurveyResponse, name))
+    return columns
 
 
-@router.get("", response_model=ResponseList)
+@router.get("", response_model=Union[ResponseList, ResponseSummaryList])
 async def get_responses(
     skip: int = 0,
     limit: int = 100,
     survey_id: int = None,
-    db: AsyncSession = Depends(get_db)
+    after_id: Optional[int] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get list of all responses."""
-    query = select(SurveyResponse).options(selectinload(SurveyResponse.answers))
-
-    if survey_id:
-        query = query.where(SurveyResponse.survey_id == survey_id)
+    """
+    Get list of all responses. Pass after_id (next_after_id of the previous page) for keyset pagination.
+
+    view=summary returns headline fields with answers_count instead of nested answers.
+    fields=id,status,... returns only the listed fields (takes precedence over view).
+    """
+    selected = parse_fields(fields, [*SurveyResponseSchema.model_fields, "answers_count"])
+    criteria = [SurveyResponse.survey_id == survey_id] if survey_id else []
+    total = await count_total(db, SurveyResponse, *criteria, cache_key=survey_id)
+
+    if selected is not None and "answers" not in selected:
+        query = select(*_response_columns(selected)).where(*criteria)
+        result = await db.execute(paginate(query, SurveyResponse.id, skip, limit, after_id))
+        rows = result.all()
+        return fieldset_response({
+            "responses": [row._asdict() for row in rows],
+            "total": total,
+            "next_after_id": next_after_id(rows, limit),
+        })
+
+    if selected is None and view == "summary":
+        query = select(*_response_columns(SurveyResponseSummary.model_fields)).where(*criteria)
+        result = await db.execute(paginate(query, SurveyResponse.id, skip, limit, after_id))
+        rows = result.all()
+        return ResponseSummaryList(
+            responses=[SurveyResponseSummary.model_validate(row, from_attributes=True) for row in rows],
+            total=total,
+            next_after_id=next_after_id(rows, limit),
+        )
 
-    query = query.offset(skip).limit(limit)
+    query = paginate(select(SurveyResponse).where(*criteria), SurveyResponse.id, skip, limit, after_id)
+    query = query.options(selectinload(SurveyResponse.answers))
     result = await db.execute(query)
     responses = result.scalars().all()
 
-    # Get total count
-    count_query = select(SurveyResponse)
-    if survey_id:
-        count_query = count_query.where(SurveyResponse.survey_id == survey_id)
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
+    if selected is not None:
+        # Nested answers were requested, so the full objects had to be loaded
+        include = set(selected) - {"answers_count"}
+        items = []
+        for response in responses:
+            item = SurveyResponseSchema.model_validate(response).model_dump(include=include)
+            if "answers_count" in selected:
+                item["answers_count"] = len(response.answers)
+            items.append(item)
+        return fieldset_response({
+            "responses": items,
+            "total": total,
+            "next_after_id": next_after_id(responses, limit),
+        })
 
-    return ResponseList(responses=responses, total=total)
+    return ResponseList(responses=responses, total=total, next_after_id=next_after_id(responses, limit))
 
 
 @router.get("/surveys/{survey_id}/results", response_model=SurveyResults)
-async def get_survey_results(survey_id: int, db: AsyncSession = Depends(get_db)):
-    """Get survey results in JSON format."""
-    # Get survey
-    survey_result = await db.execute(
-        select(Survey)
-        .where(Survey.id == survey_id)
-        .options(selectinload(Survey.questions).selectinload(Question.options))
+async def get_survey_results(
+    survey_id: int,
+    request: Request,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get survey results in JSON format.
+
+    fields=response_id,completed_at,... narrows every entry of responses;
+    answers and employees are only loaded when requested.
+    Supports If-None-Match: an unchanged survey answers 304 without a body.
+    """
+    selected = parse_fields(fields, ResponseResult.model_fields, always=("response_id",))
+
+    version = await get_survey_results_version(db, survey_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+    etag = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    # The shared computation reads in its own session: return this request's
+    # connection to the bounded read pool before waiting for it
+    await db.close()
+
+    # Identical concurrent requests share one computation of this version
+    body = await single_flight.run(
+        ("results", survey_id, tuple(selected or ()), version),
+        lambda: _in_own_session(_render_survey_results, survey_id, selected),
     )
-    survey = survey_result.scalar_one_or_none()
+    result = FastJSONResponse(body)
+    set_etag(result, etag)
+    return result
+
+
+async def _render_survey_results(db: AsyncSession, survey_id: int, selected: Optional[List[str]]) -> bytes:
+    """Build the results payload and render it to JSON."""
+    with_answers = selected is None or "answers" in selected
+    with_employee = selected is None or "employee" in selected
+
+    # Get survey
+    survey = await load_survey_definition(db, survey_id)
 
     if not survey:
         raise HTTPException(
@@ -62,15 +180,7 @@ async def get_survey_results(survey_id: int, db: AsyncSession = Depends(get_db))
         )
 
     # Get all responses with answers and employee
-    responses_result = await db.execute(
-        select(SurveyResponse)
-        .where(SurveyResponse.survey_id == survey_id)
-        .options(
-            selectinload(SurveyResponse.answers),
-            selectinload(SurveyResponse.employee)
-        )
-    )
-    responses = responses_result.scalars().all()
+    responses = await load_survey_responses(db, survey_id, with_answers, with_employee)
 
     # Get total eligible employees (active employees who started 90+ days ago)
     from datetime import datetime, timedelta
@@ -85,70 +195,39 @@ async def get_survey_results(survey_id: int, db: AsyncSession = Depends(get_db))
 
     # Build response results
     response_results = []
-    for response in responses:
-        employee = response.employee
-
-        # Build employee result
-        employee_result = EmployeeResult(
-            id=employee.id,
-            telegram_id=employee.telegram_id,
-            telegram_username=employee.telegram_username,
-            first_name=employee.first_name,
-            last_name=employee.last_name,
-        )
-
-        # Build question results
-        question_results = []
-        for answer in response.answers:
-            # Find question
-            question = next((q for q in survey.questions if q.id == answer.question_id), None)
-            if not question:
-                continue
-
-            # Get option texts for choice answers
-            answer_options_texts = None
-            if answer.answer_options:
-                answer_options_texts = []
-                for option_id in answer.answer_options:
-                    option = next((o for o in question.options if o.id == option_id), None)
-                    if option:
-                        answer_options_texts.append(option.option_text)
-
-            question_result = QuestionResult(
-                question_id=answer.question_id,
-                question_text=question.question_text,
-                question_type=question.question_type,
-                answer_text=answer.answer_text,
-                answer_options=answer_options_texts,
-            )
-            question_results.append(question_result)
-
-        response_result = ResponseResult(
-            response_id=response.id,
-            survey_id=survey.id,
-            survey_title=survey.title,
-            employee=employee_result,
-            completed_at=response.completed_at,
-            answers=question_results,
-        )
-        response_results.append(response_result)
+    for survey_response in responses:
+        if selected is None:
+            response_results.append(build_response_result(survey_response, survey))
+        else:
+            employee_result = build_employee_result(survey_response.employee) if with_employee else None
+            response_result = build_response_fields(survey_response, survey, employee_result)
+            response_results.append({name: response_result[name] for name in selected})
 
     # Calculate completion rate
     completion_rate = 0.0
     if eligible_count > 0:
-        completion_rate = len([r for r in response_results if r.completed_at]) / eligible_count
-
-    return SurveyResults(
+        completion_rate = len([r for r in responses if r.completed_at]) / eligible_count
+
+    if selected is not None:
+        return render_json({
+            "survey_id": survey.id,
+            "survey_title": survey.title,
+            "responses": response_results,
+            "total_responses": len(response_results),
+            "completion_rate": completion_rate,
+        })
+
+    return render_json(SurveyResults.model_construct(
         survey_id=survey.id,
         survey_title=survey.title,
         responses=response_results,
         total_responses=len(response_results),
         completion_rate=completion_rate,
-    )
+    ))
 
 
 @router.get("/{response_id}", response_model=SurveyResponseSchema)
-async def get_response(response_id: int, db: AsyncSession = Depends(get_db)):
+async def get_response(response_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get response by ID."""
     result = await db.execute(
         select(SurveyResponse)
@@ -167,85 +246,62 @@ async def get_response(response_id: int, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/surveys/{survey_id}/analytics", response_model=SurveyAnalytics)
-async def get_survey_analytics(survey_id: int, db: AsyncSession = Depends(get_db)):
-    """Get survey analytics with aggregated data for charts."""
-    # Get survey with questions and options
-    survey_result = await db.execute(
-        select(Survey)
-        .where(Survey.id == survey_id)
-        .options(selectinload(Survey.questions).selectinload(Question.options))
-    )
-    survey = survey_result.scalar_one_or_none()
-
-    if not survey:
+async def get_survey_analytics(
+    survey_id: int,
+    request: Request,
+    option_id: Optional[List[int]] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get survey analytics with aggregated data for charts.
+
+    Repeated option_id parameters restrict the analytics to responses that
+    selected all of those options (cross-filter).
+    Supports If-None-Match: an unchanged survey answers 304 without a body.
+    """
+    version = await get_survey_results_version(db, survey_id)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Survey not found"
         )
-
-    # Get all responses with answers (including in_progress for analytics)
-    responses_result = await db.execute(
-        select(SurveyResponse)
-        .where(SurveyResponse.survey_id == survey_id)
-        .options(selectinload(SurveyResponse.answers))
+    etag = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    # The shared computation reads in its own session
+    await db.close()
+
+    # Identical concurrent requests share one computation of this version
+    option_ids = tuple(sorted(set(option_id or ())))
+    body = await single_flight.run(
+        ("analytics", survey_id, version, option_ids),
+        lambda: _in_own_session(_render_survey_analytics, survey_id, option_ids),
     )
-    responses = responses_result.scalars().all()
+    result = FastJSONResponse(body)
+    set_etag(result, etag)
+    return result
 
-    # Build question analytics
-    question_analytics = []
 
-    for question in survey.questions:
-        # Get all answers for this question
-        all_answers = []
-        for response in responses:
-            answer = next((a for a in response.answers if a.question_id == question.id), None)
-            if answer:
-                all_answers.append(answer)
-
-        question_analytic = QuestionAnalytics(
-            question_id=question.id,
-            question_text=question.question_text,
-            question_type=question.question_type,
-            total_answers=len(all_answers),
+async def _render_survey_analytics(db: AsyncSession, survey_id: int, option_ids: tuple = ()) -> bytes:
+    """Aggregate analytics for charts and render them to JSON."""
+    # Get survey with questions and options
+    survey = await load_survey_definition(db, survey_id)
+
+    if not survey:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
         )
 
-        if question.question_type in ("single_choice", "multiple_choice"):
-            # Calculate distribution for choice questions
-            option_counts = {option.id: 0 for option in question.options}
-
-            for answer in all_answers:
-                if answer.answer_options:
-                    for option_id in answer.answer_options:
-                        if option_id in option_counts:
-                            option_counts[option_id] += 1
-
-            # Build distribution list
-            distribution = []
-            for option in question.options:
-                count = option_counts.get(option.id, 0)
-                percentage = (count / len(all_answers) * 100) if all_answers else 0
-                distribution.append({
-                    "option_id": option.id,
-                    "option": option.option_text,
-                    "count": count,
-                    "percentage": round(percentage, 2)
-                })
-
-            question_analytic.choice_distribution = distribution
-
-        elif question.question_type == "text":
-            # Collect all text responses
-            text_responses = [
-                answer.answer_text
-                for answer in all_answers
-                if answer.answer_text
-            ]
-            question_analytic.text_responses = text_responses
-
-        question_analytics.append(question_analytic)
-
-    # Calculate completion metrics
-    total_responses = len(responses)
+    # Option counts and totals are aggregated in SQL
+    question_analytics = [
+        QuestionAnalytics(**item)
+        for item in await load_question_analytics(db, survey, option_ids)
+    ]
+
+    # Calculate completion metrics (including in_progress for analytics)
+    total_responses = await count_responses(db, survey_id, option_ids)
     completion_rate = 0.0
 
     # Get eligible employees count
@@ -262,24 +318,21 @@ async def get_survey_analytics(survey_id: int, db: AsyncSession = Depends(get_db
     if eligible_count > 0:
         completion_rate = total_responses / eligible_count
 
-    return SurveyAnalytics(
+    return render_json(SurveyAnalytics(
         survey_id=survey.id,
         survey_title=survey.title,
         total_responses=total_responses,
         completed_responses=total_responses,
         completion_rate=completion_rate,
         question_analytics=question_analytics,
-    )
+    ))
 
 
 @router.get("/employees/{employee_id}/responses", response_model=SurveyResults)
-async def get_employee_responses(employee_id: int, db: AsyncSession = Depends(get_db)):
+async def get_employee_responses(employee_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get all survey responses for a specific employee."""
     # Get employee
-    employee_result = await db.execute(
-        select(Employee).where(Employee.id == employee_id)
-    )
-    employee = employee_result.scalar_one_or_none()
+    employee = await load_employee(db, employee_id)
 
     if not employee:
         raise HTTPException(
@@ -287,262 +340,222 @@ async def get_employee_responses(employee_id: int, db: AsyncSession = Depends(ge
             detail="Employee not found"
         )
 
-    # Get all responses for this employee with answers and survey
-    responses_result = await db.execute(
-        select(SurveyResponse)
-        .where(SurveyResponse.employee_id == employee_id)
-        .options(
-            selectinload(SurveyResponse.answers),
-            selectinload(SurveyResponse.survey).selectinload(Survey.questions).selectinload(Question.options)
-        )
-    )
-    responses = responses_result.scalars().all()
+    # Get all responses for this employee with answers, and their surveys
+    responses = await load_employee_responses(db, employee)
+    surveys = await load_survey_definitions(db, {response.survey_id for response in responses})
 
     # Build response results for each survey
-    response_results = []
-    survey_ids = set()
-
-    for response in responses:
-        survey_ids.add(response.survey_id)
-
-        # Build employee result
-        employee_result = EmployeeResult(
-            id=employee.id,
-            telegram_id=employee.telegram_id,
-            telegram_username=employee.telegram_username,
-            first_name=employee.first_name,
-            last_name=employee.last_name,
-        )
-
-        # Get survey for this response
-        survey = response.survey
-
-        # Build question results
-        question_results = []
-        for answer in response.answers:
-            # Find question
-            question = next((q for q in survey.questions if q.id == answer.question_id), None)
-            if not question:
-                continue
-
-            # Get option texts for choice answers
-            answer_options_texts = None
-            if answer.answer_options:
-                answer_options_texts = []
-                for option_id in answer.answer_options:
-                    option = next((o for o in question.options if o.id == option_id), None)
-                    if option:
-                        answer_options_texts.append(option.option_text)
-
-            question_result = QuestionResult(
-                question_id=answer.question_id,
-                question_text=question.question_text,
-                question_type=question.question_type,
-                answer_text=answer.answer_text,
-                answer_options=answer_options_texts,
-            )
-            question_results.append(question_result)
-
-        response_result = ResponseResult(
-            response_id=response.id,
-            survey_id=survey.id,
-            survey_title=survey.title,
-            employee=employee_result,
-            completed_at=response.completed_at,
-            answers=question_results,
-        )
-        response_results.append(response_result)
+    response_results = [
+        build_response_result(response, surveys[response.survey_id])
+        for response in responses
+    ]
 
-    # Use first survey title if available
     survey_title = "Все опросы сотрудника"
     if response_results:
-        first_response = await db.execute(
-            select(SurveyResponse)
-            .where(SurveyResponse.id == response_results[0].response_id)
-            .options(selectinload(SurveyResponse.survey))
-        )
-        first_survey = first_response.scalar_one_or_none()
-        if first_survey and first_survey.survey:
-            survey_title = f"Опросы сотрудника: {employee.first_name} {employee.last_name}"
+        survey_title = f"Опросы сотрудника: {employee.first_name} {employee.last_name}"
 
-    return SurveyResults(
+    return FastJSONResponse(SurveyResults.model_construct(
         survey_id=0,  # Multiple surveys, so 0
         survey_title=survey_title,
         responses=response_results,
         total_responses=len(response_results),
         completion_rate=1.0 if response_results else 0.0,
+    ))
+
+
+def _detach_job_schema(job: Job) -> DetachJob:
+    return DetachJob(
+        job_id=job.id,
+        survey_id=job.params["survey_id"],
+        status=job.status,
+        deleted_count=job.processed,
+        total_responses=job.total,
+        progress=job.progress,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
     )
 
 
-@router.delete("/surveys/{survey_id}/detach")
+@router.delete(
+    "/surveys/{survey_id}/detach",
+    response_model=DetachJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def detach_survey_from_all_employees(survey_id: int, db: AsyncSession = Depends(get_db)):
-    """Detach survey from all employees by deleting all survey responses."""
-    # Verify survey exists
-    survey_result = await db.execute(
-        select(Survey).where(Survey.id == survey_id)
-    )
-    survey = survey_result.scalar_one_or_none()
+    """
+    Detach survey from all employees by deleting all survey responses.
 
-    if not survey:
+    Runs in the background in short chunked transactions; poll the returned job for progress.
+    """
+    survey_result = await db.execute(select(Survey.id).where(Survey.id == survey_id))
+    if survey_result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Survey not found"
         )
 
-    # Get all response IDs for this survey
-    responses_result = await db.execute(
-        select(SurveyResponse.id).where(SurveyResponse.survey_id == survey_id)
-    )
-    response_ids = [r[0] for r in responses_result.fetchall()]
+    return _detach_job_schema(submit_detach_job(survey_id))
 
-    deleted_count = len(response_ids)
 
-    if response_ids:
-        # Delete all answers for these responses (using bulk delete)
-        await db.execute(
-            delete(Answer).where(Answer.response_id.in_(response_ids))
+@router.get("/detach-jobs/{job_id}", response_model=DetachJob)
+async def get_detach_job(job_id: str):
+    """Get detach job status and progress."""
+    job = jobs.get(job_id)
+    if not job or job.kind != DETACH_JOB:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Detach job not found"
         )
 
-        # Delete all responses
-        await db.execute(
-            delete(SurveyResponse).where(SurveyResponse.id.in_(response_ids))
-        )
+    return _detach_job_schema(job)
 
-    await db.commit()
 
-    return {"message": f"Detached survey from {deleted_count} employees", "deleted_count": deleted_count}
+def _export_file_response(file: BinaryIO, filename: str) -> StreamingResponse:
+    """
+    Send an opened cached export.
 
+    The cache may remove the file while it is being sent (newer version,
+    eviction); reading from the handle opened beforehand is unaffected.
+    """
+    size = os.fstat(file.fileno()).st_size
 
-@router.get("/surveys/{survey_id}/results/export")
-async def export_survey_results_excel(survey_id: int, db: AsyncSession = Depends(get_db)):
-    """Export survey results to Excel file."""
-    # Get survey with questions and options
-    survey_result = await db.execute(
-        select(Survey)
-        .where(Survey.id == survey_id)
-        .options(selectinload(Survey.questions).selectinload(Question.options))
+    def chunks():
+        with file:
+            while chunk := file.read(EXPORT_CHUNK_SIZE):
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(size),
+        }
     )
-    survey = survey_result.scalar_one_or_none()
 
-    if not survey:
+
+@router.get("/surveys/{survey_id}/results/export")
+async def export_survey_results_excel(survey_id: int, db: AsyncSession = Depends(get_read_db)):
+    """Export survey results to Excel file."""
+    version = await get_survey_data_version(db, survey_id)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Survey not found"
         )
 
-    # Get all responses with answers and employee
-    responses_result = await db.execute(
-        select(SurveyResponse)
-        .where(SurveyResponse.survey_id == survey_id)
-        .options(
-            selectinload(SurveyResponse.answers),
-            selectinload(SurveyResponse.employee)
+    # Unchanged surveys are served from the export cache; otherwise rows are
+    # spooled to disk as the cursor produces them and the workbook is built
+    # in the report pool, once for all concurrent downloads of this version.
+    # The build reads in its own session, so release this one first
+    await db.close()
+    file = await open_cached_export(survey_id, version)
+
+    # Generate filename with survey id and date
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"survey_{survey_id}_{timestamp}.xlsx"
+
+    return _export_file_response(file, filename)
+
+
+@router.get("/surveys/{survey_id}/results/export.csv")
+async def export_survey_results_csv(
+    survey_id: int,
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Export survey results to CSV, streamed as rows are read (optionally gzipped)."""
+    survey = await load_survey_definition(db, survey_id)
+
+    if not survey:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
         )
-    )
-    responses = responses_result.scalars().all()
-
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Результаты опроса"
-
-    # Define styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    cell_alignment = Alignment(vertical="center", wrap_text=True)
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
 
-    # Create header row
-    headers = ["№", "Сотрудник", "Telegram Username", "Дата завершения"]
-    for question in survey.questions:
-        headers.append(question.question_text)
-
-    ws.append(headers)
-
-    # Apply header style
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = thin_border
-
-    # Add data rows
-    for idx, response in enumerate(responses, 1):
-        employee = response.employee
-        completed_at = response.completed_at.strftime("%d.%m.%Y %H:%M") if response.completed_at else "Не завершено"
-
-        row_data = [
-            idx,
-            f"{employee.last_name or ''} {employee.first_name or ''}".strip() or "-",
-            employee.telegram_username or "-",
-            completed_at
-        ]
-
-        # Add answers for each question
-        for question in survey.questions:
-            answer = next((a for a in response.answers if a.question_id == question.id), None)
-
-            if answer:
-                if question.question_type == "text":
-                    row_data.append(answer.answer_text or "-")
-                elif question.question_type in ("single_choice", "multiple_choice"):
-                    if answer.answer_options:
-                        option_texts = []
-                        for option_id in answer.answer_options:
-                            option = next((o for o in question.options if o.id == option_id), None)
-                            if option:
-                                option_texts.append(option.option_text)
-                        row_data.append(", ".join(option_texts) if option_texts else "-")
-                    else:
-                        row_data.append("-")
-                else:
-                    row_data.append("-")
-            else:
-                row_data.append("-")
-
-        ws.append(row_data)
-
-        # Apply cell styles to data row
-        for cell in ws[ws.max_row]:
-            cell.alignment = cell_alignment
-            cell.border = thin_border
-
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-    # Freeze header row
-    ws.freeze_panes = "A2"
-
-    # Save to bytes
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    # Generate filename with survey title and date
-    safe_title = "".join(c for c in survey.title if c.isalnum() or c in (' ', '-', '_')).strip()
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"survey_{survey.id}_{timestamp}.xlsx"
+    filename = f"survey_{survey.id}_{timestamp}.csv"
+    if gzip:
+        filename += ".gz"
 
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_csv_chunks(survey, compress=gzip),
+        media_type=GZIP_MEDIA_TYPE if gzip else CSV_MEDIA_TYPE,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
         }
     )
+
+
+def _export_job_schema(job: Job) -> ExportJob:
+    return ExportJob(
+        job_id=job.id,
+        survey_id=job.params["survey_id"],
+        status=job.status,
+        stage=job.stage,
+        processed_rows=job.processed,
+        total_rows=job.total,
+        progress=job.progress,
+        error=job.error,
+        download_url=f"/api/v1/responses/export-jobs/{job.id}/download" if job.status == JOB_COMPLETED else None,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post(
+    "/surveys/{survey_id}/results/export-jobs",
+    response_model=ExportJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_export_job(survey_id: int, db: AsyncSession = Depends(get_read_db)):
+    """Start a background Excel export. Poll the returned job for progress."""
+    version = await get_survey_data_version(db, survey_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+
+    return _export_job_schema(submit_export_job(survey_id, version))
+
+
+@router.get("/export-jobs/{job_id}", response_model=ExportJob)
+async def get_export_job(job_id: str):
+    """Get export job status and progress."""
+    job = jobs.get(job_id)
+    if not job or job.kind != EXPORT_JOB:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+
+    return _export_job_schema(job)
+
+
+@router.get("/export-jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    """Download the file produced by a finished export job."""
+    job = jobs.get(job_id)
+    if not job or job.kind != EXPORT_JOB:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+
+    if job.status != JOB_COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job.status}"
+        )
+
+    file = export_cache.open_file(job.params["survey_id"], job.params["version"])
+    if file is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export file has expired, start a new export"
+        )
+
+    filename = f"survey_{job.params['survey_id']}_{job.finished_at.strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return _export_file_response(file, filename)
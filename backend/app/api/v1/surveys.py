@@ -1,42 +1,197 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, delete
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional, Union
+from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Survey, Question, QuestionOption
-from app.schemas import SurveyCreate, SurveyUpdate, Survey as SurveySchema, SurveyList
+from app.services.etags import make_etag, is_not_modified, set_etag, not_modified_response
+from app.services.fieldsets import parse_fields, fieldset_response
+from app.services.versions import get_survey_definition_version
+from app.services.pagination import paginate, count_total, next_after_id
+from app.services.survey_builder import insert_questions
+from app.schemas import SurveyCreate, SurveyUpdate, Survey as SurveySchema, SurveyList, SurveySummary, SurveySummaryList
 
 router = APIRouter()
 
 
-@router.get("", response_model=SurveyList)
+def _survey_columns(names):
+    """Column expressions for a survey projection; questions_count is a correlated COUNT."""
+    columns = []
+    for name in names:
+        if name == "questions_count":
+            columns.append(
+                select(func.count(Question.id))
+                .where(Question.survey_id == Survey.id)
+                .correlate(Survey)
+                .scalar_subquery()
+                .label("questions_count")
+            )
+        else:
+            columns.append(getattr(Survey, name))
+    return columns
+
+
+def _assign_changed(row, values: dict) -> bool:
+    """Set only the attributes whose value differs; returns True if any did."""
+    changed = False
+    for field, value in values.items():
+        if getattr(row, field) != value:
+            setattr(row, field, value)
+            changed = True
+    return changed
+
+
+def _match_rows(existing: list, incoming: list):
+    """
+    Pair incoming items with existing rows.
+
+    Items are matched by id only. If none of them carries an id (older
+    clients), every item is a new row and every existing row is removed, as
+    before in-place updates: matching by position would move the answers of
+    a deleted question onto the next one. Returns (pairs, removed), where
+    pairs is a list of (existing row or None for a new one, item).
+    """
+    existing = sorted(existing, key=lambda row: (row.order_index, row.id))
+    if not any(item.id is not None for item in incoming):
+        return [(None, item) for item in incoming], existing
+
+    by_id = {row.id: row for row in existing}
+    pairs = [(by_id.pop(item.id, None) if item.id is not None else None, item) for item in incoming]
+    return pairs, list(by_id.values())
+
+
+def _sync_options(db_question: Question, options_data: list) -> bool:
+    pairs, removed = _match_rows(db_question.options, options_data)
+    for db_option in removed:
+        db_question.options.remove(db_option)
+
+    changed = bool(removed)
+    for db_option, option_data in pairs:
+        values = option_data.model_dump(exclude={"id"})
+        if db_option is None:
+            db_question.options.append(QuestionOption(**values))
+            changed = True
+        else:
+            changed |= _assign_changed(db_option, values)
+    return changed
+
+
+def _sync_questions(db_survey: Survey, questions_data: list) -> bool:
+    """
+    Apply the submitted question list to the loaded survey in place.
+
+    Changed rows get an UPDATE of the changed columns, new rows are inserted
+    and missing rows deleted, all batched by the flush on commit.
+    """
+    pairs, removed = _match_rows(db_survey.questions, questions_data)
+    for db_question in removed:
+        db_survey.questions.remove(db_question)
+
+    changed = bool(removed)
+    for db_question, question_data in pairs:
+        options_data = question_data.options or []
+        values = question_data.model_dump(exclude={"id", "options"}, exclude_unset=True)
+        if db_question is None:
+            db_survey.questions.append(Question(
+                **values,
+                options=[QuestionOption(**option.model_dump(exclude={"id"})) for option in options_data],
+            ))
+            changed = True
+        else:
+            changed |= _assign_changed(db_question, values)
+            changed |= _sync_options(db_question, options_data)
+    return changed
+
+
+@router.get("", response_model=Union[SurveyList, SurveySummaryList])
 async def get_surveys(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: AsyncSession = Depends(get_db)
+    after_id: Optional[int] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get list of all surveys."""
-    query = select(Survey)
-    if active_only:
-        query = query.where(Survey.is_active == True)
+    """
+    Get list of all surveys. Pass after_id (next_after_id of the previous page) for keyset pagination.
+
+    view=summary returns headline fields with questions_count instead of nested questions.
+    fields=id,title,... returns only the listed fields (takes precedence over view).
+    """
+    selected = parse_fields(fields, [*SurveySchema.model_fields, "questions_count"])
+    criteria = [Survey.is_active == True] if active_only else []
+    total = await count_total(db, Survey, *criteria, cache_key=active_only)
+
+    if selected is not None and "questions" not in selected:
+        query = select(*_survey_columns(selected)).where(*criteria)
+        result = await db.execute(paginate(query, Survey.id, skip, limit, after_id))
+        rows = result.all()
+        return fieldset_response({
+            "surveys": [row._asdict() for row in rows],
+            "total": total,
+            "next_after_id": next_after_id(rows, limit),
+        })
+
+    if selected is None and view == "summary":
+        query = select(*_survey_columns(SurveySummary.model_fields)).where(*criteria)
+        result = await db.execute(paginate(query, Survey.id, skip, limit, after_id))
+        rows = result.all()
+        return SurveySummaryList(
+            surveys=[SurveySummary.model_validate(row, from_attributes=True) for row in rows],
+            total=total,
+            next_after_id=next_after_id(rows, limit),
+        )
 
-    query = query.offset(skip).limit(limit).options(selectinload(Survey.questions).selectinload(Question.options))
+    query = paginate(select(Survey).where(*criteria), Survey.id, skip, limit, after_id)
+    query = query.options(selectinload(Survey.questions).selectinload(Question.options))
     result = await db.execute(query)
     surveys = result.scalars().all()
 
-    # Get total count
-    count_result = await db.execute(select(Survey))
-    total = len(count_result.scalars().all())
+    if selected is not None:
+        # Nested questions were requested, so the full objects had to be loaded
+        include = set(selected) - {"questions_count"}
+        items = []
+        for survey in surveys:
+            item = SurveySchema.model_validate(survey).model_dump(include=include)
+            if "questions_count" in selected:
+                item["questions_count"] = len(survey.questions)
+            items.append(item)
+        return fieldset_response({
+            "surveys": items,
+            "total": total,
+            "next_after_id": next_after_id(surveys, limit),
+        })
 
-    return SurveyList(surveys=surveys, total=total)
+    return SurveyList(surveys=surveys, total=total, next_after_id=next_after_id(surveys, limit))
 
 
 @router.get("/{survey_id}", response_model=SurveySchema)
-async def get_survey(survey_id: int, db: AsyncSession = Depends(get_db)):
-    """Get survey by ID with questions and options."""
+async def get_survey(
+    survey_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get survey by ID with questions and options.
+
+    Supports If-None-Match: an unchanged survey answers 304 without a body.
+    """
+    version = await get_survey_definition_version(db, survey_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+    etag = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+
     result = await db.execute(
         select(Survey)
         .where(Survey.id == survey_id)
@@ -64,19 +219,11 @@ async def create_survey(survey: SurveyCreate, db: AsyncSession = Depends(get_db)
     db.add(db_survey)
     await db.flush()  # Get the survey ID
 
-    # Add questions
-    for question_data in questions_data:
-        options_data = question_data.options or []
-        question_dict = question_data.model_dump(exclude={"options"}, exclude_unset=True)
-
-        db_question = Question(survey_id=db_survey.id, **question_dict)
-        db.add(db_question)
-        await db.flush()  # Get the question ID
-
-        # Add options
-        for option_data in options_data:
-            db_option = QuestionOption(question_id=db_question.id, **option_data.model_dump())
-            db.add(db_option)
+    # Add questions and options in two bulk statements; the schema defaults
+    # match the column defaults, so every row has the same set of keys
+    await insert_questions(db, db_survey.id, [
+        question_data.model_dump() for question_data in questions_data
+    ])
 
     await db.commit()
     await db.refresh(db_survey)
@@ -111,29 +258,17 @@ async def update_survey(
         )
 
     update_data = survey_update.model_dump(exclude_unset=True, exclude={"questions"})
-    for field, value in update_data.items():
-        setattr(db_survey, field, value)
+    changed = _assign_changed(db_survey, update_data)
 
-    # Handle questions update if provided
+    # Handle questions update if provided: rows are diffed, not recreated,
+    # so answers stay attached to the questions they were given for
     if survey_update.questions is not None:
-        # Delete existing questions and options
-        for question in db_survey.questions:
-            for option in question.options:
-                await db.delete(option)
-            await db.delete(question)
+        changed |= _sync_questions(db_survey, survey_update.questions)
 
-        # Add new questions
-        for question_data in survey_update.questions:
-            options_data = question_data.options or []
-            question_dict = question_data.model_dump(exclude={"options"}, exclude_unset=True)
-
-            db_question = Question(survey_id=db_survey.id, **question_dict)
-            db.add(db_question)
-            await db.flush()
-
-            for option_data in options_data:
-                db_option = QuestionOption(question_id=db_question.id, **option_data.model_dump())
-                db.add(db_option)
+    if changed:
+        # Results, exports and ETags are versioned by Survey.updated_at; question
+        # edits don't touch the survey row, and func.now() has one-second resolution
+        db_survey.updated_at = datetime.utcnow()
 
     await db.commit()
     await db.refresh(db_survey)
@@ -149,17 +284,15 @@ async def update_survey(
 
 @router.delete("/{survey_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_survey(survey_id: int, db: AsyncSession = Depends(get_db)):
-    """Delete survey."""
-    result = await db.execute(select(Survey).where(Survey.id == survey_id))
-    db_survey = result.scalar_one_or_none()
+    """Delete survey. Questions, responses and answers are removed by ON DELETE CASCADE."""
+    result = await db.execute(delete(Survey).where(Survey.id == survey_id))
 
-    if not db_survey:
+    if not result.rowcount:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Survey not found"
         )
 
-    await db.delete(db_survey)
     await db.commit()
 
     return None
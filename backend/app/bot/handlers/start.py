@@ -1,11 +1,11 @@
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
 
-from app.database import async_session
-from app.models import Employee, SurveyResponse
+from app.database import async_session, read_session
+from app.models import Employee
+from app.bot.queries import EmployeeRow, count_open_responses, get_employee_by_telegram_id
 from app.bot.keyboards.keyboards import (
     build_main_menu_keyboard,
     build_help_keyboard,
@@ -23,7 +23,7 @@ from datetime import datetime, timedelta
 router = Router()
 
 
-async def get_employee_language(employee: Employee) -> str:
+async def get_employee_language(employee: EmployeeRow) -> str:
     """Get employee language, default to 'ru' if not set."""
     return employee.language if employee.language else LANG_RU
 
@@ -36,25 +36,19 @@ async def show_language_selection(message: Message):
     )
 
 
-async def show_main_menu(message, employee: Employee, language: str):
+async def show_main_menu(message, employee: EmployeeRow, language: str):
     """Show main menu with localized content."""
-    async with async_session() as db:
+    async with read_session() as db:
         # Check for pending surveys
-        result = await db.execute(
-            select(SurveyResponse).where(
-                SurveyResponse.employee_id == employee.id,
-                SurveyResponse.status.in_(["pending", "in_progress"])
-            )
-        )
-        pending_responses = result.scalars().all()
+        pending_count = await count_open_responses(db, employee.id)
 
     name = employee.first_name or "Кесиптеш"
 
-    if pending_responses:
+    if pending_count:
         text = (
             f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
             f"{get_welcome_message(language, 'intro')}\n\n"
-            f"{get_welcome_message(language, 'pending_surveys', count=len(pending_responses))}"
+            f"{get_welcome_message(language, 'pending_surveys', count=pending_count)}"
         )
     else:
         text = (
@@ -76,10 +70,7 @@ async def cmd_start(message: Message):
 
     async with async_session() as db:
         # Check if employee exists
-        result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = result.scalar_one_or_none()
+        employee = await get_employee_by_telegram_id(db, telegram_id)
 
         # Auto-register new employee
         if not employee:
@@ -93,16 +84,21 @@ async def cmd_start(message: Message):
             )
             db.add(new_employee)
             await db.commit()
-            await db.refresh(new_employee)
-            employee = new_employee
+            employee = EmployeeRow(
+                id=new_employee.id,
+                first_name=new_employee.first_name,
+                last_name=new_employee.last_name,
+                language=new_employee.language,
+                is_active=new_employee.is_active,
+            )
 
-        # Check if language is set
-        if not employee.language:
-            await show_language_selection(message)
-            return
+    # Check if language is set
+    if not employee.language:
+        await show_language_selection(message)
+        return
 
-        # Show main menu with employee's language
-        await show_main_menu(message, employee, employee.language)
+    # Show main menu with employee's language
+    await show_main_menu(message, employee, employee.language)
 
 
 @router.callback_query(F.data.startswith("lang_"))
@@ -117,24 +113,20 @@ async def cmd_select_language(callback: CallbackQuery):
 
     async with async_session() as db:
         # Get employee
-        result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = result.scalar_one_or_none()
-
-        if not employee:
-            await callback.message.edit_text("❌ " + get_message(LANG_RU, "employee_not_found"))
-            await callback.answer()
-            return
+        employee = await get_employee_by_telegram_id(db, telegram_id)
 
         # Update employee language
-        await db.execute(
-            update(Employee).where(Employee.id == employee.id).values(language=language)
-        )
-        await db.commit()
+        if employee:
+            await db.execute(
+                update(Employee).where(Employee.id == employee.id).values(language=language)
+            )
+            await db.commit()
 
-        # Refresh employee object
-        await db.refresh(employee)
+    # Reply after the write session is released
+    if not employee:
+        await callback.message.edit_text("❌ " + get_message(LANG_RU, "employee_not_found"))
+        await callback.answer()
+        return
 
     # Update the message with selected language confirmation
     lang_name = "Кыргызча" if language == LANG_KG else "Русский"
@@ -154,17 +146,14 @@ async def cmd_change_language(callback: CallbackQuery):
     """Handle language change request."""
     telegram_id = callback.from_user.id
 
-    async with async_session() as db:
+    async with read_session() as db:
         # Get employee
-        result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = result.scalar_one_or_none()
+        employee = await get_employee_by_telegram_id(db, telegram_id)
 
-        if not employee:
-            await callback.message.edit_text("❌ " + get_message(LANG_RU, "employee_not_found"))
-            await callback.answer()
-            return
+    if not employee:
+        await callback.message.edit_text("❌ " + get_message(LANG_RU, "employee_not_found"))
+        await callback.answer()
+        return
 
     # Show language selection keyboard
     await callback.message.edit_text(
@@ -178,12 +167,9 @@ async def cmd_change_language(callback: CallbackQuery):
 @router.callback_query(F.data == "help")
 async def cmd_help(callback: CallbackQuery):
     """Show help information."""
-    async with async_session() as db:
+    async with read_session() as db:
         # Get employee for language
-        result = await db.execute(
-            select(Employee).where(Employee.telegram_id == callback.from_user.id)
-        )
-        employee = result.scalar_one_or_none()
+        employee = await get_employee_by_telegram_id(db, callback.from_user.id)
         language = await get_employee_language(employee) if employee else LANG_RU
 
     help_text = get_help_message(language)
@@ -201,46 +187,37 @@ async def cmd_back_to_menu(callback: CallbackQuery):
     """Return to main menu."""
     telegram_id = callback.from_user.id
 
-    async with async_session() as db:
+    async with read_session() as db:
         # Get employee
-        emp_result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = emp_result.scalar_one_or_none()
-
-        if not employee:
-            await callback.message.edit_text("❌ " + get_message(LANG_RU, "employee_not_found"))
-            await callback.answer()
-            return
+        employee = await get_employee_by_telegram_id(db, telegram_id)
 
         # Check for pending surveys
-        result = await db.execute(
-            select(SurveyResponse).where(
-                SurveyResponse.employee_id == employee.id,
-                SurveyResponse.status.in_(["pending", "in_progress"])
-            )
-        )
-        pending_responses = result.scalars().all()
+        pending_count = await count_open_responses(db, employee.id) if employee else 0
 
-        language = await get_employee_language(employee)
-        name = employee.first_name or "Кесиптеш"
+    if not employee:
+        await callback.message.edit_text("❌ " + get_message(LANG_RU, "employee_not_found"))
+        await callback.answer()
+        return
 
-        if pending_responses:
-            text = (
-                f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
-                f"{get_welcome_message(language, 'intro')}\n\n"
-                f"{get_welcome_message(language, 'pending_surveys', count=len(pending_responses))}"
-            )
-        else:
-            text = (
-                f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
-                f"{get_welcome_message(language, 'intro')}\n\n"
-                f"{get_welcome_message(language, 'no_surveys')}"
-            )
+    language = await get_employee_language(employee)
+    name = employee.first_name or "Кесиптеш"
 
-        await callback.message.edit_text(
-            text,
-            reply_markup=build_main_menu_keyboard(language)
+    if pending_count:
+        text = (
+            f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
+            f"{get_welcome_message(language, 'intro')}\n\n"
+            f"{get_welcome_message(language, 'pending_surveys', count=pending_count)}"
         )
+    else:
+        text = (
+            f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
+            f"{get_welcome_message(language, 'intro')}\n\n"
+            f"{get_welcome_message(language, 'no_surveys')}"
+        )
+
+    await callback.message.edit_text(
+        text,
+        reply_markup=build_main_menu_keyboard(language)
+    )
 
     await callback.answer()
@@ -3,13 +3,22 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import StateFilter
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
 
-from app.database import async_session
-from app.models import Employee, Survey, Question, SurveyResponse, Answer, QuestionOption
+from app.database import async_session, read_session
+from app.models import Answer, AnswerSelectedOption
+from app.bot.queries import (
+    QuestionRow,
+    complete_response,
+    count_open_responses,
+    get_employee_by_telegram_id,
+    get_open_response,
+    get_response_summary,
+    get_survey_questions,
+    list_open_surveys,
+    set_response_status,
+)
 from app.bot.fsm import SurveyStates
 from app.bot.keyboards.keyboards import (
     build_single_choice_keyboard,
@@ -47,70 +56,52 @@ async def start_survey(callback: CallbackQuery, state: FSMContext):
     telegram_id = callback.from_user.id
     logger.info(f"start_survey called: survey_id={survey_id}, telegram_id={telegram_id}")
 
-    async with async_session() as db:
-        # Get employee
-        emp_result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = emp_result.scalar_one_or_none()
-        language = get_employee_language(employee)
-
-        if not employee:
-            logger.warning(f"Employee not found for telegram_id: {telegram_id}")
-            await callback.message.edit_text(get_message(language, "employee_not_found"))
-            return
+    async with read_session() as db:
+        # Get employee, pending response and survey questions
+        employee = await get_employee_by_telegram_id(db, telegram_id)
+        response = await get_open_response(db, survey_id, employee.id) if employee else None
+        questions = await get_survey_questions(db, survey_id) if response else []
+    language = get_employee_language(employee)
 
-        # Get pending response
-        result = await db.execute(
-            select(SurveyResponse).where(
-                SurveyResponse.survey_id == survey_id,
-                SurveyResponse.employee_id == employee.id,
-                SurveyResponse.status.in_(["pending", "in_progress"])
-            )
-        )
-        response = result.scalar_one_or_none()
+    if not employee:
+        logger.warning(f"Employee not found for telegram_id: {telegram_id}")
+        await callback.message.edit_text(get_message(language, "employee_not_found"))
+        return
 
-        if not response:
-            logger.warning(f"No pending survey found for employee_id: {employee.id}, survey_id: {survey_id}")
-            await callback.message.edit_text(get_message(language, "no_pending_survey"))
-            return
+    if not response:
+        logger.warning(f"No pending survey found for employee_id: {employee.id}, survey_id: {survey_id}")
+        await callback.message.edit_text(get_message(language, "no_pending_survey"))
+        return
 
-        # Update status to in_progress
-        response.status = "in_progress"
+    # Update status to in_progress
+    async with async_session() as db:
+        await set_response_status(db, response.id, "in_progress")
         await db.commit()
 
-        # Get survey with questions
-        survey_result = await db.execute(
-            select(Survey)
-            .where(Survey.id == survey_id)
-            .options(selectinload(Survey.questions).selectinload(Question.options))
-        )
-        survey = survey_result.scalar_one_or_none()
-
-        if not survey or not survey.questions:
-            logger.error(f"Survey has no questions for survey_id: {survey_id}")
-            await callback.message.edit_text(get_message(language, "survey_no_questions"))
-            return
+    if not questions:
+        logger.error(f"Survey has no questions for survey_id: {survey_id}")
+        await callback.message.edit_text(get_message(language, "survey_no_questions"))
+        return
 
-        # Store survey and response data in FSM
-        await state.update_data(
-            survey_id=survey_id,
-            response_id=response.id,
-            current_question_index=0,
-            selected_answers=[],
-            language=language,
-        )
-        logger.info(f"Stored FSM data for user {telegram_id}: survey_id={survey_id}, response_id={response.id}")
+    # Store survey and response data in FSM
+    await state.update_data(
+        survey_id=survey_id,
+        response_id=response.id,
+        current_question_index=0,
+        selected_answers=[],
+        language=language,
+    )
+    logger.info(f"Stored FSM data for user {telegram_id}: survey_id={survey_id}, response_id={response.id}")
 
-        # Show first question
-        first_question = survey.questions[0]
-        logger.info(f"About to show first question: id={first_question.id}, type={first_question.question_type}")
-        await show_question(callback.message, first_question, callback.message.bot, callback.from_user.id, state)
+    # Show first question
+    first_question = questions[0]
+    logger.info(f"About to show first question: id={first_question.id}, type={first_question.question_type}")
+    await show_question(callback.message, first_question, callback.message.bot, callback.from_user.id, state)
 
-        await callback.answer()
+    await callback.answer()
 
 
-async def show_question(message: Message, question: Question, bot, user_id: int, state: FSMContext = None):
+async def show_question(message: Message, question: QuestionRow, bot, user_id: int, state: FSMContext = None):
     """Display question based on type and set appropriate FSM state."""
     logger.info(f"show_question: question_id={question.id}, type={question.question_type}, has_state={state is not None}")
 
@@ -207,68 +198,61 @@ async def handle_text_answer(message: Message, state: FSMContext):
         await state.clear()
         return
 
-    async with async_session() as db:
-        # Get survey with questions
-        survey_result = await db.execute(
-            select(Survey)
-            .where(Survey.id == survey_id)
-            .options(selectinload(Survey.questions).selectinload(Question.options))
-        )
-        survey = survey_result.scalar_one_or_none()
+    async with read_session() as db:
+        # Get survey questions
+        questions = await get_survey_questions(db, survey_id)
 
-        logger.info(f"DEBUG: survey_id={survey_id}, questions_count={len(survey.questions) if survey else 0}, current_index={current_question_index}")
-        if survey:
-            for i, q in enumerate(survey.questions):
-                logger.info(f"  Question {i}: id={q.id}, type={q.question_type}")
+    logger.info(f"DEBUG: survey_id={survey_id}, questions_count={len(questions)}, current_index={current_question_index}")
 
-        if not survey or current_question_index >= len(survey.questions):
-            logger.error(f"Invalid question index: {current_question_index}, total: {len(survey.questions) if survey else 0}")
-            await message.answer(get_message(language, "error_question_not_found"))
-            await state.clear()
-            return
+    if current_question_index >= len(questions):
+        logger.error(f"Invalid question index: {current_question_index}, total: {len(questions)}")
+        await message.answer(get_message(language, "error_question_not_found"))
+        await state.clear()
+        return
 
-        question = survey.questions[current_question_index]
-        logger.info(f"Current question: id={question.id}, type={question.question_type}")
+    question = questions[current_question_index]
+    logger.info(f"Current question: id={question.id}, type={question.question_type}")
 
-        # Validate answer (text questions always require an answer)
-        if not message.text or not message.text.strip():
-            logger.warning(f"Empty answer received from user {telegram_id}")
-            await message.answer(get_message(language, "please_enter_answer"))
-            return
+    # Validate answer (text questions always require an answer)
+    if not message.text or not message.text.strip():
+        logger.warning(f"Empty answer received from user {telegram_id}")
+        await message.answer(get_message(language, "please_enter_answer"))
+        return
 
-        # Save answer to database
-        answer = Answer(
-            question_id=question.id,
-            response_id=response_id,
-            answer_text=message.text.strip()
-        )
-        db.add(answer)
-        await db.commit()
-        logger.info(f"Saved answer for question {question.id}, response_id={response_id}")
+    new_index = current_question_index + 1
+    is_last = new_index >= len(questions)
 
-        # Update current question index
-        new_index = current_question_index + 1
-        await state.update_data(current_question_index=new_index)
+    # Save answer to database
+    answer = Answer(
+        question_id=question.id,
+        response_id=response_id,
+        answer_text=message.text.strip()
+    )
+    if not await save_answer(answer, response_id, is_last):
+        await state.clear()
+        await message.answer(get_message(language, "survey_unavailable"))
+        return
+    logger.info(f"Saved answer for question {question.id}, response_id={response_id}")
 
-        # Check if this was the last question
-        if new_index >= len(survey.questions):
-            # Complete survey
-            await complete_survey(db, response_id)
-            await db.commit()
-            # Send message BEFORE clearing state to ensure user gets confirmation
-            await message.answer(
-                get_message(language, "survey_completed"),
-                reply_markup=build_help_keyboard(language)
-            )
-            # Clear state after sending message, wrapped in try/except
-            try:
-                await state.clear()
-            except Exception as e:
-                logger.warning(f"Failed to clear state: {e}")
-        else:
-            # Show next question
-            next_question = survey.questions[new_index]
-            await show_question(message, next_question, message.bot, telegram_id, state)
+    # Update current question index
+    await state.update_data(current_question_index=new_index)
+
+    # Check if this was the last question
+    if is_last:
+        # Send message BEFORE clearing state to ensure user gets confirmation
+        await message.answer(
+            get_message(language, "survey_completed"),
+            reply_markup=build_help_keyboard(language)
+        )
+        # Clear state after sending message, wrapped in try/except
+        try:
+            await state.clear()
+        except Exception as e:
+            logger.warning(f"Failed to clear state: {e}")
+    else:
+        # Show next question
+        next_question = questions[new_index]
+        await show_question(message, next_question, message.bot, telegram_id, state)
 
 
 @router.callback_query(F.data.startswith("option_"))
@@ -303,86 +287,84 @@ async def handle_single_choice(callback: CallbackQuery, state: FSMContext):
     logger.info(f"Retrieved FSM data: survey_id={state_data.get('survey_id')}, response_id={state_data.get('response_id')}, current_question_index={state_data.get('current_question_index')}")
     language = state_data.get("language", LANG_RU)
 
-    async with async_session() as db:
-        # Get current state data
-        survey_id = state_data.get("survey_id")
-        response_id = state_data.get("response_id")
-        current_question_index = state_data.get("current_question_index", 0)
-
-        if not survey_id or not response_id:
-            logger.error(f"Missing survey or response data in FSM. Got: survey_id={survey_id}, response_id={response_id}")
-            await callback.message.edit_text(get_message(language, "error_no_data"))
-            await callback.answer()
-            return
-
-        # Get survey with questions
-        survey_result = await db.execute(
-            select(Survey)
-            .where(Survey.id == survey_id)
-            .options(selectinload(Survey.questions).selectinload(Question.options))
-        )
-        survey = survey_result.scalar_one_or_none()
+    # Get current state data
+    survey_id = state_data.get("survey_id")
+    response_id = state_data.get("response_id")
+    current_question_index = state_data.get("current_question_index", 0)
 
-        if not survey or current_question_index >= len(survey.questions):
-            logger.error(f"Invalid question index: {current_question_index}")
-            await callback.message.edit_text(get_message(language, "error_question_not_found"))
-            await callback.answer()
-            return
+    if not survey_id or not response_id:
+        logger.error(f"Missing survey or response data in FSM. Got: survey_id={survey_id}, response_id={response_id}")
+        await callback.message.edit_text(get_message(language, "error_no_data"))
+        await callback.answer()
+        return
 
-        question = survey.questions[current_question_index]
-        option_id = int(callback.data.split("_")[1])
+    async with read_session() as db:
+        # Get survey questions
+        questions = await get_survey_questions(db, survey_id)
 
-        # Validate option exists
-        option = None
-        for opt in question.options:
-            if opt.id == option_id:
-                option = opt
-                break
+    if current_question_index >= len(questions):
+        logger.error(f"Invalid question index: {current_question_index}")
+        await callback.message.edit_text(get_message(language, "error_question_not_found"))
+        await callback.answer()
+        return
 
-        if not option:
-            logger.error(f"Option not found: {option_id}")
-            await callback.message.edit_text(get_message(language, "error_option_not_found"))
-            await callback.answer()
-            return
+    question = questions[current_question_index]
+    option_id = int(callback.data.split("_")[1])
 
-        # Save answer to database
-        logger.info(f"Saving answer: question_id={question.id}, response_id={response_id}, option_id={option.id}")
-        answer = Answer(
-            question_id=question.id,
-            response_id=response_id,
-            answer_options=[option.id]
-        )
-        db.add(answer)
+    # Validate option exists
+    option = None
+    for opt in question.options:
+        if opt.id == option_id:
+            option = opt
+            break
 
-        # Update current question index
-        new_index = current_question_index + 1
-        await state.update_data(current_question_index=new_index)
-        logger.info(f"Updated question index from {current_question_index} to {new_index}")
+    if not option:
+        logger.error(f"Option not found: {option_id}")
+        await callback.message.edit_text(get_message(language, "error_option_not_found"))
+        await callback.answer()
+        return
 
-        # Check if this was the last question
-        if new_index >= len(survey.questions):
-            # Complete survey
-            logger.info(f"Last question reached, completing survey for response_id={response_id}")
-            await complete_survey(db, response_id)
-            # Send message BEFORE clearing state to ensure user gets confirmation
-            await callback.message.edit_text(
-                get_message(language, "survey_completed"),
-                reply_markup=build_help_keyboard(language)
-            )
-            # Clear state after sending message, wrapped in try/except
-            try:
-                await state.clear()
-            except Exception as e:
-                logger.warning(f"Failed to clear state: {e}")
-        else:
-            # Show next question
-            next_question = survey.questions[new_index]
-            logger.info(f"Moving to next question: index={new_index}, question_id={next_question.id}, type={next_question.question_type}")
-            await show_question(callback.message, next_question, callback.message.bot, telegram_id, state)
+    new_index = current_question_index + 1
+    is_last = new_index >= len(questions)
 
-        await db.commit()
-        logger.info(f"Answer committed to database for question {question.id}")
+    # Save answer to database; committed before Telegram calls
+    logger.info(f"Saving answer: question_id={question.id}, response_id={response_id}, option_id={option.id}")
+    answer = Answer(
+        question_id=question.id,
+        response_id=response_id,
+        answer_options=[option.id],
+        selected_options=[AnswerSelectedOption(option_id=option.id)],
+    )
+    if not await save_answer(answer, response_id, is_last):
+        await state.clear()
+        await callback.message.edit_text(get_message(language, "survey_unavailable"))
         await callback.answer()
+        return
+    logger.info(f"Answer committed to database for question {question.id}")
+
+    # Update current question index
+    await state.update_data(current_question_index=new_index)
+    logger.info(f"Updated question index from {current_question_index} to {new_index}")
+
+    # Check if this was the last question
+    if is_last:
+        # Send message BEFORE clearing state to ensure user gets confirmation
+        await callback.message.edit_text(
+            get_message(language, "survey_completed"),
+            reply_markup=build_help_keyboard(language)
+        )
+        # Clear state after sending message, wrapped in try/except
+        try:
+            await state.clear()
+        except Exception as e:
+            logger.warning(f"Failed to clear state: {e}")
+    else:
+        # Show next question
+        next_question = questions[new_index]
+        logger.info(f"Moving to next question: index={new_index}, question_id={next_question.id}, type={next_question.question_type}")
+        await show_question(callback.message, next_question, callback.message.bot, telegram_id, state)
+
+    await callback.answer()
 
 
 @router.callback_query(F.data.startswith("toggle_option_"))
@@ -408,8 +390,31 @@ async def toggle_option(callback: CallbackQuery, state: FSMContext):
     current_question_index = state_data.get("current_question_index", 0)
     logger.info(f"Current question index: {current_question_index}")
 
+    survey_id = state_data.get("survey_id")
+    if not survey_id:
+        await callback.answer()
+        return
+
+    # Get survey questions
+    async with read_session() as db:
+        questions = await get_survey_questions(db, survey_id)
+
+    if current_question_index >= len(questions):
+        await callback.answer()
+        return
+
+    question = questions[current_question_index]
+
+    # Only options of the current question can be selected (a stale keyboard
+    # of another question sends foreign option ids)
+    option_ids = {opt.id for opt in question.options}
+    if option_id not in option_ids:
+        logger.warning(f"Option {option_id} does not belong to question {question.id}")
+        await callback.answer()
+        return
+
     # Get selected options
-    selected_answers = state_data.get("selected_answers", [])
+    selected_answers = [i for i in state_data.get("selected_answers", []) if i in option_ids]
     if option_id in selected_answers:
         selected_answers.remove(option_id)
         logger.info(f"Removed option {option_id} from selection")
@@ -420,47 +425,27 @@ async def toggle_option(callback: CallbackQuery, state: FSMContext):
     # Update state
     await state.update_data(selected_answers=selected_answers)
 
-    # Get survey with questions
-    async with async_session() as db:
-        survey_id = state_data.get("survey_id")
-        if not survey_id:
-            await callback.answer(f"Toggled option {option_id}")
-            return
-
-        survey_result = await db.execute(
-            select(Survey)
-            .where(Survey.id == survey_id)
-            .options(selectinload(Survey.questions).selectinload(Question.options))
-        )
-        survey = survey_result.scalar_one_or_none()
-
-        if not survey:
-            await callback.answer(f"Toggled option {option_id}")
-            return
-
-        question = survey.questions[current_question_index]
-
-        # Get localized question text
-        language = state_data.get("language", LANG_RU)
-        question_text = question.question_text  # Default (RU)
-        if language == LANG_KG and question.question_text_kg:
-            question_text = question.question_text_kg
+    # Get localized question text
+    language = state_data.get("language", LANG_RU)
+    question_text = question.question_text  # Default (RU)
+    if language == LANG_KG and question.question_text_kg:
+        question_text = question.question_text_kg
 
-        # Rebuild keyboard with updated selection
-        options_list = [
-            {"id": opt.id, "option_text": opt.option_text}
-            for opt in question.options
-        ]
-        keyboard = build_multiple_choice_keyboard(options_list, selected_answers)
+    # Rebuild keyboard with updated selection
+    options_list = [
+        {"id": opt.id, "option_text": opt.option_text}
+        for opt in question.options
+    ]
+    keyboard = build_multiple_choice_keyboard(options_list, selected_answers)
 
-        # Update message
-        await callback.message.edit_text(
-            f"❓ {question_text}\n\n"
-            f"{get_message(language, 'select_multiple')}:",
-            reply_markup=keyboard
-        )
+    # Update message
+    await callback.message.edit_text(
+        f"❓ {question_text}\n\n"
+        f"{get_message(language, 'select_multiple')}:",
+        reply_markup=keyboard
+    )
 
-        await callback.answer()
+    await callback.answer()
 
 
 @router.callback_query(F.data == "submit_options")
@@ -485,123 +470,143 @@ async def submit_multiple_choice(callback: CallbackQuery, state: FSMContext):
     logger.info(f"Retrieved FSM data: survey_id={state_data.get('survey_id')}, response_id={state_data.get('response_id')}, current_question_index={state_data.get('current_question_index')}, selected_answers={state_data.get('selected_answers')}")
     language = state_data.get("language", LANG_RU)
 
-    async with async_session() as db:
-        # Get current state data
-        survey_id = state_data.get("survey_id")
-        response_id = state_data.get("response_id")
-        current_question_index = state_data.get("current_question_index", 0)
-        selected_answers = state_data.get("selected_answers", [])
-
-        if not survey_id or not response_id:
-            logger.error("Missing survey or response data in FSM")
-            await callback.message.edit_text(get_message(language, "error_no_data"))
-            await callback.answer()
-            return
+    # Get current state data
+    survey_id = state_data.get("survey_id")
+    response_id = state_data.get("response_id")
+    current_question_index = state_data.get("current_question_index", 0)
+    selected_answers = state_data.get("selected_answers", [])
 
-        # Get survey with questions
-        survey_result = await db.execute(
-            select(Survey)
-            .where(Survey.id == survey_id)
-            .options(selectinload(Survey.questions).selectinload(Question.options))
-        )
-        survey = survey_result.scalar_one_or_none()
+    if not survey_id or not response_id:
+        logger.error("Missing survey or response data in FSM")
+        await callback.message.edit_text(get_message(language, "error_no_data"))
+        await callback.answer()
+        return
 
-        if not survey or current_question_index >= len(survey.questions):
-            logger.error(f"Invalid question index: {current_question_index}")
-            await callback.message.edit_text(get_message(language, "error_question_not_found"))
-            await callback.answer()
-            return
+    async with read_session() as db:
+        # Get survey questions
+        questions = await get_survey_questions(db, survey_id)
 
-        question = survey.questions[current_question_index]
-
-        # Get localized question text
-        question_text = question.question_text  # Default (RU)
-        if language == LANG_KG and question.question_text_kg:
-            question_text = question.question_text_kg
-
-        # Validate that at least one option is selected
-        if not selected_answers:
-            await callback.message.edit_text(
-                f"❓ {question_text}\n\n"
-                f"{get_message(language, 'select_at_least_one')}",
-                reply_markup=build_multiple_choice_keyboard(
-                    [{"id": opt.id, "option_text": opt.option_text} for opt in question.options],
-                    selected_answers
-                )
+    if current_question_index >= len(questions):
+        logger.error(f"Invalid question index: {current_question_index}")
+        await callback.message.edit_text(get_message(language, "error_question_not_found"))
+        await callback.answer()
+        return
+
+    question = questions[current_question_index]
+
+    # Keep only options of this question, once each and in selection order
+    option_ids = {opt.id for opt in question.options}
+    selected_answers = [i for i in dict.fromkeys(selected_answers) if i in option_ids]
+
+    # Get localized question text
+    question_text = question.question_text  # Default (RU)
+    if language == LANG_KG and question.question_text_kg:
+        question_text = question.question_text_kg
+
+    # Validate that at least one option is selected
+    if not selected_answers:
+        await callback.message.edit_text(
+            f"❓ {question_text}\n\n"
+            f"{get_message(language, 'select_at_least_one')}",
+            reply_markup=build_multiple_choice_keyboard(
+                [{"id": opt.id, "option_text": opt.option_text} for opt in question.options],
+                selected_answers
             )
-            await callback.answer()
-            return
+        )
+        await callback.answer()
+        return
+
+    new_index = current_question_index + 1
+    is_last = new_index >= len(questions)
+
+    # Save answers to database (as JSON array and as association rows);
+    # committed before Telegram calls
+    answer = Answer(
+        question_id=question.id,
+        response_id=response_id,
+        answer_options=selected_answers,
+        selected_options=[AnswerSelectedOption(option_id=option_id) for option_id in selected_answers],
+    )
+    if not await save_answer(answer, response_id, is_last):
+        await state.clear()
+        await callback.message.edit_text(get_message(language, "survey_unavailable"))
+        await callback.answer()
+        return
+
+    # Update current question index
+    await state.update_data(current_question_index=new_index)
 
-        # Save answers to database (as JSON array)
-        answer = Answer(
-            question_id=question.id,
-            response_id=response_id,
-            answer_options=selected_answers
+    # Check if this was the last question
+    if is_last:
+        # Send message BEFORE clearing state to ensure user gets confirmation
+        await callback.message.edit_text(
+            get_message(language, "survey_completed"),
+            reply_markup=build_help_keyboard(language)
         )
-        db.add(answer)
+        # Clear state after sending message, wrapped in try/except
+        try:
+            await state.clear()
+        except Exception as e:
+            logger.warning(f"Failed to clear state: {e}")
+    else:
+        # Show next question
+        next_question = questions[new_index]
+        await show_question(callback.message, next_question, callback.message.bot, telegram_id, state)
 
-        # Update current question index
-        new_index = current_question_index + 1
-        await state.update_data(current_question_index=new_index)
+    await callback.answer()
 
-        # Check if this was the last question
-        if new_index >= len(survey.questions):
-            # Complete survey
-            await complete_survey(db, response_id)
-            # Send message BEFORE clearing state to ensure user gets confirmation
-            await callback.message.edit_text(
-                get_message(language, "survey_completed"),
-                reply_markup=build_help_keyboard(language)
-            )
-            # Clear state after sending message, wrapped in try/except
-            try:
-                await state.clear()
-            except Exception as e:
-                logger.warning(f"Failed to clear state: {e}")
-        else:
-            # Show next question
-            next_question = survey.questions[new_index]
-            await show_question(callback.message, next_question, callback.message.bot, telegram_id, state)
 
+async def save_answer(answer: Answer, response_id: int, is_last: bool) -> bool:
+    """
+    Insert an answer, completing the survey after the last one.
+
+    Returns False if foreign keys reject the answer: its response or question
+    was deleted meanwhile (survey detached or deleted, employee deleted).
+    """
+    async with async_session() as db:
+        db.add(answer)
+        try:
+            # Flush separately: complete_survey swallows its own errors
+            await db.flush()
+        except IntegrityError as e:
+            logger.warning(f"Answer for response_id {response_id} rejected, survey no longer available: {e}")
+            return False
+        if is_last:
+            logger.info(f"Last question reached, completing survey for response_id={response_id}")
+            await complete_survey(db, response_id)
         await db.commit()
-        await callback.answer()
+    return True
 
 
 async def complete_survey(db: AsyncSession, response_id: int):
     """Complete survey by updating status and completed_at."""
     try:
-        response = await db.get(SurveyResponse, response_id)
-        if response:
-            response.status = "completed"
-            response.completed_at = datetime.utcnow()
-
-            # Get employee and survey information
-            employee_result = await db.execute(
-                select(Employee).where(Employee.id == response.employee_id)
-            )
-            employee = employee_result.scalar_one_or_none()
+        if not await complete_response(db, response_id):
+            return
+
+        # Get employee and survey information
+        summary = await get_response_summary(db, response_id)
+
+        # Commit the status before notifying HR: no write lock during network calls
+        await db.commit()
 
-            if employee:
-                survey_result = await db.execute(
-                    select(Survey).where(Survey.id == response.survey_id)
+        if summary:
+            employee_name = f"{summary.first_name} {summary.last_name}"
+
+            # Send notification to HR
+            notification_service = NotificationService(bot)
+            for hr_telegram_id in settings.hr_telegram_id_list:
+                await notification_service.send_survey_completion_notification(
+                    hr_telegram_id=hr_telegram_id,
+                    employee_name=employee_name,
+                    survey_title=summary.survey_title
                 )
-                survey = survey_result.scalar_one_or_none()
-
-                if survey:
-                    # Send notification to HR
-                    notification_service = NotificationService(bot)
-                    for hr_telegram_id in settings.hr_telegram_id_list:
-                        await notification_service.send_survey_completion_notification(
-                            hr_telegram_id=hr_telegram_id,
-                            employee_name=f"{employee.first_name} {employee.last_name}",
-                            survey_title=survey.title
-                        )
-
-                    logger.info(
-                        f"Survey completed for response_id: {response_id}, "
-                        f"employee: {employee.first_name} {employee.last_name}, "
-                        f"survey: {survey.title}"
-                    )
+
+            logger.info(
+                f"Survey completed for response_id: {response_id}, "
+                f"employee: {employee_name}, "
+                f"survey: {summary.survey_title}"
+            )
     except Exception as e:
         logger.error(f"Error completing survey: {e}", exc_info=True)
 
@@ -620,11 +625,9 @@ async def cancel_survey(callback: CallbackQuery, state: FSMContext):
     async with async_session() as db:
         if response_id:
             try:
-                response = await db.get(SurveyResponse, response_id)
-                if response:
-                    response.status = "cancelled"
-                    await db.commit()
-                    logger.info(f"Survey cancelled for response_id: {response_id}")
+                await set_response_status(db, response_id, "cancelled")
+                await db.commit()
+                logger.info(f"Survey cancelled for response_id: {response_id}")
             except Exception as e:
                 logger.error(f"Error cancelling survey: {e}")
 
@@ -648,85 +651,62 @@ async def show_my_surveys(callback: CallbackQuery):
     """Show list of available surveys assigned to the employee."""
     telegram_id = callback.from_user.id
 
-    async with async_session() as db:
+    async with read_session() as db:
         # Get employee
-        emp_result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = emp_result.scalar_one_or_none()
-        language = get_employee_language(employee)
+        employee = await get_employee_by_telegram_id(db, telegram_id)
 
-        if not employee:
-            logger.warning(f"Employee not found for telegram_id: {telegram_id}")
-            await callback.message.edit_text(get_message(language, "employee_not_found"))
-            await callback.answer()
-            return
+        # Get surveys with a pending or in_progress response of this employee
+        open_surveys = await list_open_surveys(db, employee.id) if employee else []
+    language = get_employee_language(employee)
 
-        # Get survey responses for this employee (pending or in_progress)
-        result = await db.execute(
-            select(SurveyResponse)
-            .where(
-                SurveyResponse.employee_id == employee.id,
-                SurveyResponse.status.in_(["pending", "in_progress"])
-            )
-            .options(selectinload(SurveyResponse.survey))
-        )
-        responses = result.scalars().all()
+    if not employee:
+        logger.warning(f"Employee not found for telegram_id: {telegram_id}")
+        await callback.message.edit_text(get_message(language, "employee_not_found"))
+        await callback.answer()
+        return
 
-        if not responses:
-            await callback.message.edit_text(
-                get_message(language, "no_surveys"),
-                reply_markup=build_help_keyboard(language)
-            )
-            await callback.answer()
-            return
+    # Build keyboard with assigned surveys
+    buttons = []
+    for survey in open_surveys:
+        if survey.is_active:
+            status_emoji = "⏳" if survey.status == "pending" else "🔄"
+            buttons.append([
+                InlineKeyboardButton(
+                    text=f"{status_emoji} {survey.title}",
+                    callback_data=f"start_survey_{survey.survey_id}"
+                )
+            ])
 
-        # Build keyboard with assigned surveys
-        buttons = []
-        for response in responses:
-            survey = response.survey
-            if survey and survey.is_active:
-                status_emoji = "⏳" if response.status == "pending" else "🔄"
-                buttons.append([
-                    InlineKeyboardButton(
-                        text=f"{status_emoji} {survey.title}",
-                        callback_data=f"start_survey_{survey.id}"
-                    )
-                ])
-
-        if not buttons:
-            await callback.message.edit_text(
-                get_message(language, "no_surveys"),
-                reply_markup=build_help_keyboard(language)
-            )
-            await callback.answer()
-            return
+    if not buttons:
+        await callback.message.edit_text(
+            get_message(language, "no_surveys"),
+            reply_markup=build_help_keyboard(language)
+        )
+        await callback.answer()
+        return
 
-        # Add back button
-        back_text = get_message(language, "back")
-        buttons.append([
-            InlineKeyboardButton(text=back_text, callback_data="back_to_menu")
-        ])
+    # Add back button
+    back_text = get_message(language, "back")
+    buttons.append([
+        InlineKeyboardButton(text=back_text, callback_data="back_to_menu")
+    ])
 
-        keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
+    keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
 
-        await callback.message.edit_text(
-            get_message(language, "select_survey"),
-            reply_markup=keyboard
-        )
+    await callback.message.edit_text(
+        get_message(language, "select_survey"),
+        reply_markup=keyboard
+    )
 
-        await callback.answer()
+    await callback.answer()
 
 
 @router.callback_query(F.data == "help")
 async def show_help(callback: CallbackQuery):
     """Show help information."""
-    async with async_session() as db:
+    async with read_session() as db:
         # Get employee for language
-        result = await db.execute(
-            select(Employee).where(Employee.telegram_id == callback.from_user.id)
-        )
-        employee = result.scalar_one_or_none()
+        employee = await get_employee_by_telegram_id(db, callback.from_user.id)
         language = get_employee_language(employee)
 
     help_text = get_help_message(language)
@@ -744,48 +724,37 @@ async def back_to_menu(callback: CallbackQuery):
     """Return to main menu."""
     telegram_id = callback.from_user.id
 
-    async with async_session() as db:
+    async with read_session() as db:
         # Get employee
-        emp_result = await db.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
-        )
-        employee = emp_result.scalar_one_or_none()
-        language = get_employee_language(employee)
-
-        if not employee:
-            await callback.message.edit_text(get_message(language, "employee_not_found"))
-            await callback.answer()
-            return
+        employee = await get_employee_by_telegram_id(db, telegram_id)
 
         # Check for pending surveys
-        result = await db.execute(
-            select(SurveyResponse).where(
-                SurveyResponse.employee_id == employee.id,
-                SurveyResponse.status.in_(["pending", "in_progress"])
-            )
-        )
-        pending_responses = result.scalars().all()
+        pending_count = await count_open_responses(db, employee.id) if employee else 0
+    language = get_employee_language(employee)
 
-        name = employee.first_name or "Кесиптеш"
+    if not employee:
+        await callback.message.edit_text(get_message(language, "employee_not_found"))
+        await callback.answer()
+        return
 
-        if pending_responses:
-            text = (
-                f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
-                f"{get_welcome_message(language, 'intro')}\n\n"
-                f"{get_welcome_message(language, 'pending_surveys', count=len(pending_responses))}"
-            )
-        else:
-            text = (
-                f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
-                f"{get_welcome_message(language, 'intro')}\n\n"
-                f"{get_welcome_message(language, 'no_surveys')}"
-            )
+    name = employee.first_name or "Кесиптеш"
 
-        await callback.message.edit_text(
-            text,
-            reply_markup=build_main_menu_keyboard(language)
+    if pending_count:
+        text = (
+            f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
+            f"{get_welcome_message(language, 'intro')}\n\n"
+            f"{get_welcome_message(language, 'pending_surveys', count=pending_count)}"
+        )
+    else:
+        text = (
+            f"👋 {get_welcome_message(language, 'greeting', name=name)}\n\n"
+            f"{get_welcome_message(language, 'intro')}\n\n"
+            f"{get_welcome_message(language, 'no_surveys')}"
         )
 
-    await callback.answer()
-
+    await callback.message.edit_text(
+        text,
+        reply_markup=build_main_menu_keyboard(language)
+    )
 
+    await callback.answer()
@@ -1,14 +1,14 @@
 """Localization helper for bot messages."""
 
 from typing import Optional
-from app.models import Employee
+from app.bot.queries import EmployeeRow
 
 # Language constants
 LANG_KG = "kg"
 LANG_RU = "ru"
 
 
-def get_employee_language(employee: Optional[Employee]) -> str:
+def get_employee_language(employee: Optional[EmployeeRow]) -> str:
     """Get employee language, default to 'ru' if not set."""
     if employee and employee.language:
         return employee.language
@@ -29,6 +29,7 @@ SURVEY_MESSAGES = {
         "error_question_not_found": "Ката: Суралма табылган жок.",
         "error_option_not_found": "Ката: Жооп варианты табылган жок.",
         "error_wrong_state": "Абал катасы. Сурамды 'Менин сурамдарым' менюсу аркылуу кайрадан баштаңыз.",
+        "survey_unavailable": "Бул сурам мындан ары жеткиликтүү эмес.",
         "please_enter_answer": "Түзөт: жооп бер.",
         "available_surveys": "📋 Жеткиликтүү сурамдар\n\nАзыр жеткиликтүү сурам жок.",
         "select_survey": "📋 Жеткиликтүү сурамдар\n\nӨтүү үчүн сауалды тандаңыз:",
@@ -48,6 +49,7 @@ SURVEY_MESSAGES = {
         "error_question_not_found": "Ошибка: вопрос не найден.",
         "error_option_not_found": "Ошибка: вариант ответа не найден.",
         "error_wrong_state": "Ошибка состояния. Пожалуйста, начните опрос заново через меню 'Мои опросы'.",
+        "survey_unavailable": "Этот опрос больше недоступен.",
         "please_enter_answer": "Пожалуйста, введите ответ.",
         "available_surveys": "📋 Доступные опросы\n\nВ данный момент нет доступных опросов.",
         "select_survey": "📋 Доступные опросы\n\nВыберите опрос для прохождения:",
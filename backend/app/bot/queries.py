@@ -0,0 +1,185 @@
+"""
+Запросы горячего пути бота.
+
+Обработчики выполняют одни и те же запросы на каждое обновление Telegram:
+сотрудник по telegram_id, открытый ответ на опрос, вопросы опроса. Здесь они
+построены один раз при импорте модуля с bindparam() вместо значений, поэтому
+на каждое обновление не строится новая конструкция select(), а
+скомпилированный SQL берётся из кэша компиляции SQLAlchemy.
+
+Результаты возвращаются лёгкими кортежами (NamedTuple) без ORM-сущностей:
+нет identity map, отслеживания изменений и ленивой загрузки связей.
+"""
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Employee, Question, QuestionOption, Survey, SurveyResponse
+
+OPEN_STATUSES = ("pending", "in_progress")
+
+
+class EmployeeRow(NamedTuple):
+    id: int
+    first_name: Optional[str]
+    last_name: Optional[str]
+    language: Optional[str]
+    is_active: bool
+
+
+class ResponseRow(NamedTuple):
+    id: int
+    status: str
+
+
+class OptionRow(NamedTuple):
+    id: int
+    option_text: str
+
+
+class QuestionRow(NamedTuple):
+    id: int
+    question_text: str
+    question_text_kg: Optional[str]
+    question_type: str
+    options: List[OptionRow]
+
+
+class ResponseSummaryRow(NamedTuple):
+    first_name: Optional[str]
+    last_name: Optional[str]
+    survey_title: str
+
+
+class OpenSurveyRow(NamedTuple):
+    survey_id: int
+    title: str
+    is_active: bool
+    status: str
+
+
+_EMPLOYEE_BY_TELEGRAM_ID = select(
+    Employee.id,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.language,
+    Employee.is_active,
+).where(Employee.telegram_id == bindparam("telegram_id"))
+
+_OPEN_RESPONSE = select(SurveyResponse.id, SurveyResponse.status).where(
+    SurveyResponse.survey_id == bindparam("survey_id"),
+    SurveyResponse.employee_id == bindparam("employee_id"),
+    SurveyResponse.status.in_(OPEN_STATUSES),
+)
+
+_OPEN_RESPONSES_COUNT = select(func.count(SurveyResponse.id)).where(
+    SurveyResponse.employee_id == bindparam("employee_id"),
+    SurveyResponse.status.in_(OPEN_STATUSES),
+)
+
+_OPEN_SURVEYS = (
+    select(Survey.id, Survey.title, Survey.is_active, SurveyResponse.status)
+    .select_from(SurveyResponse)
+    .join(Survey, Survey.id == SurveyResponse.survey_id)
+    .where(
+        SurveyResponse.employee_id == bindparam("employee_id"),
+        SurveyResponse.status.in_(OPEN_STATUSES),
+    )
+    .order_by(SurveyResponse.id)
+)
+
+# Questions and their options in one query, in the order of the ORM relationships
+_SURVEY_QUESTIONS = (
+    select(
+        Question.id,
+        Question.question_text,
+        Question.question_text_kg,
+        Question.question_type,
+        QuestionOption.id,
+        QuestionOption.option_text,
+    )
+    .outerjoin(QuestionOption, QuestionOption.question_id == Question.id)
+    .where(Question.survey_id == bindparam("survey_id"))
+    .order_by(Question.order_index, Question.id, QuestionOption.order_index, QuestionOption.id)
+)
+
+_RESPONSE_SUMMARY = (
+    select(Employee.first_name, Employee.last_name, Survey.title)
+    .select_from(SurveyResponse)
+    .join(Employee, Employee.id == SurveyResponse.employee_id)
+    .join(Survey, Survey.id == SurveyResponse.survey_id)
+    .where(SurveyResponse.id == bindparam("response_id"))
+)
+
+# No identity map to synchronize: the handlers don't load responses as entities
+_SET_RESPONSE_STATUS = (
+    update(SurveyResponse)
+    .where(SurveyResponse.id == bindparam("response_id"))
+    .values(status=bindparam("status"))
+    .execution_options(synchronize_session=False)
+)
+
+_COMPLETE_RESPONSE = (
+    update(SurveyResponse)
+    .where(SurveyResponse.id == bindparam("response_id"))
+    .values(status="completed", completed_at=bindparam("completed_at"))
+    .execution_options(synchronize_session=False)
+)
+
+
+async def get_employee_by_telegram_id(db: AsyncSession, telegram_id: int) -> Optional[EmployeeRow]:
+    result = await db.execute(_EMPLOYEE_BY_TELEGRAM_ID, {"telegram_id": telegram_id})
+    row = result.first()
+    return EmployeeRow(*row) if row else None
+
+
+async def get_open_response(db: AsyncSession, survey_id: int, employee_id: int) -> Optional[ResponseRow]:
+    """The pending or in-progress response of an employee to a survey."""
+    result = await db.execute(_OPEN_RESPONSE, {"survey_id": survey_id, "employee_id": employee_id})
+    row = result.first()
+    return ResponseRow(*row) if row else None
+
+
+async def count_open_responses(db: AsyncSession, employee_id: int) -> int:
+    result = await db.execute(_OPEN_RESPONSES_COUNT, {"employee_id": employee_id})
+    return result.scalar() or 0
+
+
+async def list_open_surveys(db: AsyncSession, employee_id: int) -> List[OpenSurveyRow]:
+    """Surveys with a pending or in-progress response of the employee."""
+    result = await db.execute(_OPEN_SURVEYS, {"employee_id": employee_id})
+    return [OpenSurveyRow(*row) for row in result]
+
+
+async def get_survey_questions(db: AsyncSession, survey_id: int) -> List[QuestionRow]:
+    """Questions of a survey with their options; empty if the survey has none or doesn't exist."""
+    result = await db.execute(_SURVEY_QUESTIONS, {"survey_id": survey_id})
+    questions: List[QuestionRow] = []
+    for question_id, text, text_kg, question_type, option_id, option_text in result:
+        if not questions or questions[-1].id != question_id:
+            questions.append(QuestionRow(question_id, text, text_kg, question_type, []))
+        if option_id is not None:
+            questions[-1].options.append(OptionRow(option_id, option_text))
+    return questions
+
+
+async def set_response_status(db: AsyncSession, response_id: int, status: str) -> None:
+    """Set the status of a response; the caller commits."""
+    await db.execute(_SET_RESPONSE_STATUS, {"response_id": response_id, "status": status})
+
+
+async def complete_response(db: AsyncSession, response_id: int) -> bool:
+    """Mark a response completed; returns False if it doesn't exist. The caller commits."""
+    result = await db.execute(
+        _COMPLETE_RESPONSE, {"response_id": response_id, "completed_at": datetime.utcnow()}
+    )
+    return bool(result.rowcount)
+
+
+async def get_response_summary(db: AsyncSession, response_id: int) -> Optional[ResponseSummaryRow]:
+    """Employee name and survey title of a response, for notifications."""
+    result = await db.execute(_RESPONSE_SUMMARY, {"response_id": response_id})
+    row = result.first()
+    return ResponseSummaryRow(*row) if row else None
@@ -1,17 +1,50 @@
 """
 Сервис для отправки уведомлений через Telegram бот.
 """
+import asyncio
 import logging
 from typing import Optional
 from aiogram import Bot
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Employee, Survey, SurveyResponse
 from app.config import settings
+from app.bot.services.outbox import outbox
 
 logger = logging.getLogger(__name__)
 
 
+def format_survey_invite(first_name: str, survey_title: str, survey_description: Optional[str]) -> str:
+    """Текст приглашения на опрос."""
+    return (
+        f"👋 <b>Привет, {first_name}!</b>\n\n"
+        f"Вас приглашают пройти опрос: <b>{survey_title}</b>\n\n"
+        f"{survey_description if survey_description else 'Описание опроса отсутствует.'}\n\n"
+        f"Для начала прохождения опроса нажмите кнопку ниже:"
+    )
+
+
+def format_reminder(survey_title: str, survey_description: Optional[str], days_remaining: Optional[int] = None) -> str:
+    """Текст напоминания об опросе."""
+    message_parts = [
+        f"⏰ <b>Напоминание!</b>\n\n",
+        f"У вас есть опрос: <b>{survey_title}</b>\n\n"
+    ]
+
+    if days_remaining is not None:
+        message_parts.append(
+            f"⏳ До дедлайна осталось <b>{days_remaining} дн.</b>\n\n"
+        )
+
+    message_parts.extend([
+        f"{survey_description if survey_description else 'Описание опроса отсутствует.'}\n\n",
+        f"Для продолжения прохождения опроса нажмите кнопку ниже:"
+    ])
+
+    return "".join(message_parts)
+
+
 class NotificationService:
     """Сервис для управления уведомлениями в Telegram."""
 
@@ -56,12 +89,7 @@ class NotificationService:
                 return {"success": False, "error": "Survey not found"}
 
             # Формируем сообщение
-            message = (
-                f"👋 <b>Привет, {employee.first_name}!</b>\n\n"
-                f"Вас приглашают пройти опрос: <b>{survey.title}</b>\n\n"
-                f"{survey.description if survey.description else 'Описание опроса отсутствует.'}\n\n"
-                f"Для начала прохождения опроса нажмите кнопку ниже:"
-            )
+            message = format_survey_invite(employee.first_name, survey.title, survey.description)
 
             # Отправляем сообщение
             await self.bot.send_message(
@@ -128,23 +156,11 @@ class NotificationService:
                 logger.error(f"Survey with id={survey_id} not found")
                 return {"success": False, "error": "Survey not found"}
 
-            # Формируем сообщение
-            message_parts = [
-                f"⏰ <b>Напоминание!</b>\n\n",
-                f"У вас есть опрос: <b>{survey.title}</b>\n\n"
-            ]
-
-            if days_remaining is not None:
-                message_parts.append(
-                    f"⏳ До дедлайна осталось <b>{days_remaining} дн.</b>\n\n"
-                )
+            # Соединение из пула чтения не держим, пока идёт запрос к Telegram
+            await db.close()
 
-            message_parts.extend([
-                f"{survey.description if survey.description else 'Описание опроса отсутствует.'}\n\n",
-                f"Для продолжения прохождения опроса нажмите кнопку ниже:"
-            ])
-
-            message = "".join(message_parts)
+            # Формируем сообщение
+            message = format_reminder(survey.title, survey.description, days_remaining)
 
             # Отправляем сообщение
             await self.bot.send_message(
@@ -244,57 +260,75 @@ class NotificationService:
         try:
             # Получаем опрос
             survey_result = await db.execute(
-                select(Survey).where(Survey.id == survey_id)
+                select(Survey.title, Survey.description).where(Survey.id == survey_id)
             )
-            survey = survey_result.scalar_one_or_none()
+            survey = survey_result.one_or_none()
 
             if not survey:
                 logger.error(f"Survey with id={survey_id} not found")
                 return {"success": False, "error": "Survey not found"}
 
-            # Получаем все ответы с pending статусом
-            responses_result = await db.execute(
-                select(SurveyResponse).where(
+            # Получаем все ответы с pending статусом вместе с сотрудниками одним запросом
+            recipients_result = await db.execute(
+                select(Employee.id, Employee.first_name, Employee.last_name, Employee.telegram_id)
+                .join(SurveyResponse, SurveyResponse.employee_id == Employee.id)
+                .where(
                     SurveyResponse.survey_id == survey_id,
                     SurveyResponse.status == "pending"
                 )
+                .order_by(SurveyResponse.id)
             )
-            responses = responses_result.scalars().all()
-
-            results = []
-            for response in responses:
-                employee_result = await db.execute(
-                    select(Employee).where(Employee.id == response.employee_id)
-                )
-                employee = employee_result.scalar_one_or_none()
-
-                if not employee:
-                    logger.warning(f"Employee not found for response {response.id}")
-                    continue
-
-                # Отправляем напоминание для каждого дня
-                for day in days:
-                    result = await self.send_reminder(
-                        employee_id=employee.id,
-                        survey_id=survey_id,
-                        db=db,
-                        days_remaining=day
-                    )
-                    results.append({
-                        "employee_id": employee.id,
-                        "employee_name": f"{employee.first_name} {employee.last_name}",
-                        "telegram_id": employee.telegram_id,
-                        "day": day,
-                        **result
-                    })
+            recipients = recipients_result.all()
+
+            # Соединение из пула чтения не держим, пока идёт рассылка
+            await db.close()
+
+            # Отправка идёт параллельно, но не более OUTBOX_WORKERS получателей
+            # одновременно и в общем лимите скорости бота
+            semaphore = asyncio.Semaphore(settings.OUTBOX_WORKERS)
+
+            async def remind(recipient) -> list:
+                employee_id, first_name, last_name, telegram_id = recipient
+                recipient_results = []
+                async with semaphore:
+                    # Напоминания одному сотруднику отправляются по порядку
+                    for day in days:
+                        result = await outbox.send(
+                            telegram_id,
+                            format_reminder(survey.title, survey.description, day),
+                            bot=self.bot,
+                        )
+                        if result["success"]:
+                            result = {
+                                "success": True,
+                                "employee_telegram_id": telegram_id,
+                                "survey_title": survey.title,
+                                "message_id": None
+                            }
+                        recipient_results.append({
+                            "employee_id": employee_id,
+                            "employee_name": f"{first_name} {last_name}",
+                            "telegram_id": telegram_id,
+                            "day": day,
+                            **result
+                        })
+                return recipient_results
+
+            per_recipient = await asyncio.gather(*(remind(recipient) for recipient in recipients))
+            results = [result for recipient_results in per_recipient for result in recipient_results]
+            succeeded = sum(1 for result in results if result["success"])
 
             logger.info(
-                f"Sent {len(results)} reminder notifications for survey '{survey.title}'"
+                f"Sent {succeeded} of {len(results)} reminder notifications "
+                f"to {len(recipients)} employees for survey '{survey.title}'"
             )
 
             return {
                 "success": True,
                 "total_sent": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "recipients": len(recipients),
                 "results": results
             }
 
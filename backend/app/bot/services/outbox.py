@@ -0,0 +1,131 @@
+"""
+Очередь исходящих сообщений Telegram.
+
+Массовые рассылки (приглашения, напоминания) не отправляются напрямую из
+обработчиков запросов: сообщения ставятся в ограниченную очередь, которую
+разбирают несколько воркеров с общим ограничением скорости, чтобы не
+упираться в лимиты Telegram (около 30 сообщений в секунду на бота).
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Сколько раз повторять отправку после TelegramRetryAfter
+MAX_RETRY_AFTER_ATTEMPTS = 3
+
+
+@dataclass
+class OutboundMessage:
+    chat_id: int
+    text: str
+
+
+class RateLimiter:
+    """Spaces calls at least 1 / rate seconds apart across all callers."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Push every following call back, e.g. after Telegram asked to retry later."""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class Outbox:
+    """Rate-limited sender with a bounded queue drained by background workers."""
+
+    def __init__(self, rate_per_second: float, workers: int, max_queue: int):
+        self.workers = workers
+        self._limiter = RateLimiter(rate_per_second)
+        self._queue: "asyncio.Queue[OutboundMessage]" = asyncio.Queue(maxsize=max_queue)
+        self._tasks: List[asyncio.Task] = []
+        self._bot: Optional[Bot] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, bot: Bot) -> None:
+        self._bot = bot
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"outbox-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Outbox started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not self._queue.empty():
+            logger.warning(f"Outbox stopped with {self._queue.qsize()} unsent messages")
+
+    async def put(self, message: OutboundMessage) -> None:
+        """Queue a message; waits while the queue is full."""
+        await self._queue.put(message)
+
+    async def put_many(self, messages: Iterable[OutboundMessage]) -> int:
+        count = 0
+        for message in messages:
+            await self._queue.put(message)
+            count += 1
+        return count
+
+    async def send(self, chat_id: int, text: str, bot: Optional[Bot] = None) -> dict:
+        """Send one message now, within the shared rate limit."""
+        bot = bot or self._bot
+        if bot is None:
+            return {"success": False, "error": "Bot disabled"}
+
+        for attempt in range(1, MAX_RETRY_AFTER_ATTEMPTS + 1):
+            await self._limiter.wait()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text, parse_mode="HTML")
+                return {"success": True}
+            except TelegramRetryAfter as e:
+                logger.warning(f"Telegram flood control, retry after {e.retry_after}s")
+                self._limiter.pause(e.retry_after)
+                if attempt == MAX_RETRY_AFTER_ATTEMPTS:
+                    return {"success": False, "error": str(e)}
+            except Exception as e:
+                logger.error(f"Error sending message to {chat_id}: {str(e)}")
+                return {"success": False, "error": str(e)}
+
+    async def _worker(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self.send(message.chat_id, message.text)
+            except Exception as e:
+                logger.error(f"Outbox worker error: {str(e)}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+
+outbox = Outbox(
+    rate_per_second=settings.OUTBOX_RATE_PER_SECOND,
+    workers=settings.OUTBOX_WORKERS,
+    max_queue=settings.OUTBOX_QUEUE_SIZE,
+)
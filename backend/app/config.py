@@ -14,6 +14,12 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./hrbot.db"
+    DB_READ_POOL_SIZE: int = 4
+    DB_READ_POOL_TIMEOUT_SECONDS: int = 30
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    DB_CACHE_SIZE_MB: int = 32
+    DB_MMAP_SIZE_MB: int = 256
+    DETACH_CHUNK_SIZE: int = 200
 
     # HR Admin
     HR_TELEGRAM_IDS: str = ""
@@ -21,6 +27,24 @@ class Settings(BaseSettings):
     # Bot Behavior
     REMINDER_INTERVAL_MINUTES: int = 1440
     MAX_REMINDER_ATTEMPTS: int = 3
+    OUTBOX_RATE_PER_SECOND: float = 25
+    OUTBOX_WORKERS: int = 4
+    OUTBOX_QUEUE_SIZE: int = 10000
+    INVITE_BATCH_SIZE: int = 500
+    SCHEDULER_ENABLED: bool = False
+    SCHEDULER_RUN_AT: str = "10:00"
+
+    # API
+    COUNT_CACHE_TTL_SECONDS: int = 0
+    RESULTS_CACHE_TTL_SECONDS: int = 30
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 5
+
+    # Reports
+    REPORT_POOL_WORKERS: int = 2
+    EXPORT_CACHE_DIR: str = "./export_cache"
+    EXPORT_CACHE_MAX_MB: int = 512
+    EXPORT_CACHE_MAX_AGE_HOURS: int = 24
 
     @property
     def hr_telegram_id_list(self) -> List[int]:
@@ -1,19 +1,88 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
-# Create async engine
+_url = make_url(settings.DATABASE_URL)
+_is_sqlite = _url.get_backend_name() == "sqlite"
+# An in-memory database exists only inside its single connection
+_is_sqlite_file = _is_sqlite and _url.database not in (None, "", ":memory:")
+
+
+def _sqlite_pragmas(read_only: bool) -> list:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",  # Durable in WAL mode, fsync only on checkpoints
+        f"PRAGMA cache_size=-{settings.DB_CACHE_SIZE_MB * 1024}",  # Negative value is in KiB
+        f"PRAGMA mmap_size={settings.DB_MMAP_SIZE_MB * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}",
+        # SQLite enforces foreign keys (and ON DELETE CASCADE) only when enabled on each connection
+        "PRAGMA foreign_keys=ON",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _apply_pragmas_on_connect(target, pragmas: list) -> None:
+    @event.listens_for(target.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+# File databases are pooled explicitly: aiosqlite defaults to NullPool, which
+# opens a new connection (and reapplies the PRAGMAs) for every session.
+
+# Write engine: SQLite allows one writer at a time, so writes queue for the
+# single connection in the pool instead of retrying on "database is locked"
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
+    **(
+        {"poolclass": AsyncAdaptedQueuePool, "pool_size": 1, "max_overflow": 0}
+        if _is_sqlite_file else {}
+    ),
 )
 
-# Create async session factory
+# Read engine: in WAL mode readers don't block the writer and aren't blocked by
+# it. The pool is bounded: each connection is a thread with its own page cache
+# and mmap, so readers beyond DB_READ_POOL_SIZE wait for a free connection.
+# Code that opens a read session while holding another must release the first
+# (see the shared computations in api/v1/responses.py), or it may wait forever.
+if _is_sqlite_file:
+    read_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_READ_POOL_TIMEOUT_SECONDS,
+    )
+else:
+    read_engine = engine
+
+if _is_sqlite:
+    _apply_pragmas_on_connect(engine, _sqlite_pragmas(read_only=False))
+if _is_sqlite_file:
+    _apply_pragmas_on_connect(read_engine, _sqlite_pragmas(read_only=True))
+
+# Create async session factories
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+read_session = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
 # Base class for models
 Base = declarative_base()
@@ -28,7 +97,24 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+# Dependency for read-only endpoints (results, analytics, exports, lists)
+async def get_read_db() -> AsyncSession:
+    async with read_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 # Initialize database
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+# Close pooled connections: each aiosqlite connection runs in its own
+# non-daemon thread, so a process exits only after the pools are disposed
+async def dispose_engines():
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
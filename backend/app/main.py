@@ -4,9 +4,17 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import init_db
+from app.database import dispose_engines, engine, init_db
+from app.migrations import MIGRATIONS, run_migrations
 from app.api.v1 import router as api_v1_router
+from app.services.compression import CompressionMiddleware
+from app.services.jobs import jobs
+from app.services.report_pool import start_report_pool, shutdown_report_pool
+from app.services.reminders import reminder_engine
+from app.services.scheduler import scheduler
+from app.services.singleflight import single_flight
 from app.bot import bot, dp, storage
+from app.bot.services.outbox import outbox
 from app.bot.handlers.start import router as start_router
 from app.bot.handlers.survey import router as survey_router
 from aiogram.types import Update
@@ -30,7 +38,16 @@ dp.include_router(survey_router)
 async def lifespan(app: FastAPI):
     """Manage app lifespan - startup and shutdown."""
     # Startup
+    # create_all creates tables with all model indexes on a fresh database, but
+    # does not add indexes to tables that already exist: those are created by
+    # migrations (IF NOT EXISTS, so on a fresh database they are no-ops)
     await init_db()
+    await run_migrations(engine, MIGRATIONS)
+    start_report_pool()
+    outbox.start(bot)
+    reminder_engine.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
     polling_task = asyncio.create_task(dp.start_polling(bot, handle_signals=False))
 
     yield
@@ -41,8 +58,15 @@ async def lifespan(app: FastAPI):
         await polling_task
     except asyncio.CancelledError:
         pass
+    await scheduler.stop()
+    await reminder_engine.stop()
+    await jobs.shutdown()
+    await single_flight.shutdown()
+    await outbox.stop()
     await bot.session.close()
     await storage.close()
+    shutdown_report_pool()
+    await dispose_engines()
 
 # Create FastAPI app
 app = FastAPI(
@@ -61,6 +85,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (results, analytics, CSV streams)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    level=settings.COMPRESSION_LEVEL,
+)
+
 
 @app.get("/")
 async def root():
@@ -0,0 +1,21 @@
+from app.migrations.runner import (
+    Migration,
+    run_migrations,
+    get_applied_versions,
+    add_column,
+    create_index,
+    backfill_in_batches,
+    backfill_by_key_ranges,
+)
+from app.migrations.steps import MIGRATIONS
+
+__all__ = [
+    "Migration",
+    "MIGRATIONS",
+    "run_migrations",
+    "get_applied_versions",
+    "add_column",
+    "create_index",
+    "backfill_in_batches",
+    "backfill_by_key_ranges",
+]
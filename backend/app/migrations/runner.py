@@ -0,0 +1,158 @@
+"""
+Версионные миграции схемы БД.
+
+Применённые миграции записываются в таблицу schema_version; при запуске
+выполняются только новые, по возрастанию версии. Каждая миграция сама
+управляет транзакциями и должна быть идемпотентной: если процесс упал
+после изменения схемы, но до записи версии, миграция выполнится повторно.
+
+Заполнение существующих строк (backfill) выполняется пачками по
+BACKFILL_BATCH_SIZE строк в отдельных коротких транзакциях, поэтому
+блокировка записи не держится на всё время миграции и её можно запускать
+на работающей базе.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+# Пауза между пачками, чтобы ожидающие записи успели захватить блокировку
+BACKFILL_PAUSE_SECONDS = 0.01
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[AsyncEngine], Awaitable[None]]
+
+
+async def _ensure_version_table(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR(255) NOT NULL, "
+            "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+
+
+async def get_applied_versions(engine: AsyncEngine) -> List[int]:
+    await _ensure_version_table(engine)
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT version FROM schema_version ORDER BY version"))
+        return [version for (version,) in result]
+
+
+async def run_migrations(engine: AsyncEngine, migrations: Iterable[Migration]) -> List[Migration]:
+    """Apply pending migrations in version order; returns the ones applied."""
+    applied = set(await get_applied_versions(engine))
+    done = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        logger.info(f"Applying migration {migration.version}: {migration.name}")
+        await migration.upgrade(engine)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("INSERT INTO schema_version (version, name) VALUES (:version, :name)"),
+                {"version": migration.version, "name": migration.name},
+            )
+        done.append(migration)
+    return done
+
+
+async def _table_columns(conn: AsyncConnection, table: str) -> Optional[set]:
+    def read(sync_conn):
+        inspector = inspect(sync_conn)
+        if not inspector.has_table(table):
+            return None
+        return {column["name"] for column in inspector.get_columns(table)}
+
+    return await conn.run_sync(read)
+
+
+async def add_column(engine: AsyncEngine, table: str, column: str, ddl: str) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN unless the column exists; returns True if it was added.
+
+    Tables that don't exist yet are skipped: init_db creates them with every column.
+    """
+    async with engine.begin() as conn:
+        columns = await _table_columns(conn, table)
+        if columns is None or column in columns:
+            return False
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        return True
+
+
+async def create_index(engine: AsyncEngine, name: str, table: str, columns: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+async def backfill_in_batches(
+    engine: AsyncEngine,
+    table: str,
+    assignments: str,
+    condition: str,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    key: str = "id",
+) -> int:
+    """
+    UPDATE table SET assignments for rows matching condition, batch_size rows per transaction.
+
+    The assignments must make condition false for updated rows, otherwise the
+    loop never ends. Returns the number of rows updated.
+    """
+    statement = text(
+        f"UPDATE {table} SET {assignments} "
+        f"WHERE {key} IN (SELECT {key} FROM {table} WHERE {condition} LIMIT :limit)"
+    )
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(statement, {"limit": batch_size})
+        if not result.rowcount:
+            return total
+        total += result.rowcount
+        await asyncio.sleep(BACKFILL_PAUSE_SECONDS)
+
+
+async def backfill_by_key_ranges(
+    engine: AsyncEngine,
+    table: str,
+    statement: str,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    key: str = "id",
+) -> int:
+    """
+    Run statement for consecutive ranges of table.key, batch_size keys per transaction.
+
+    The statement receives :start and :end and must restrict itself to
+    start < key <= end. Unlike backfill_in_batches it may write to another
+    table, and it must be safe to repeat for the same range. Returns the
+    number of rows written.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"SELECT min({key}), max({key}) FROM {table}"))
+        min_key, max_key = result.one()
+    if max_key is None:
+        return 0
+
+    total = 0
+    start = min_key - 1
+    while start < max_key:
+        end = start + batch_size
+        async with engine.begin() as conn:
+            result = await conn.execute(text(statement), {"start": start, "end": end})
+        total += max(result.rowcount, 0)
+        start = end
+        await asyncio.sleep(BACKFILL_PAUSE_SECONDS)
+    return total
@@ -0,0 +1,70 @@
+"""
+Список миграций схемы.
+
+Новые миграции добавляются в конец MIGRATIONS со следующим номером версии.
+Таблицы новой базы создаёт init_db по моделям, поэтому миграции меняют
+только уже существующие таблицы и должны быть идемпотентными.
+"""
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.migrations.runner import Migration, add_column, backfill_by_key_ranges, backfill_in_batches, create_index
+
+
+async def add_employee_language(engine: AsyncEngine) -> None:
+    await add_column(engine, "employees", "language", "VARCHAR(2) DEFAULT 'ru'")
+    await backfill_in_batches(engine, "employees", "language = 'ru'", "language IS NULL")
+
+
+async def add_employee_gender_age(engine: AsyncEngine) -> None:
+    await add_column(engine, "employees", "gender", "VARCHAR(10)")
+    await add_column(engine, "employees", "age", "INTEGER")
+
+
+async def add_employee_org_fields(engine: AsyncEngine) -> None:
+    await add_column(engine, "employees", "branch", "VARCHAR(255)")
+    await add_column(engine, "employees", "department", "VARCHAR(255)")
+    await add_column(engine, "employees", "position", "VARCHAR(255)")
+
+
+async def add_question_languages(engine: AsyncEngine) -> None:
+    await add_column(engine, "questions", "question_text_ru", "TEXT")
+    await add_column(engine, "questions", "question_text_kg", "TEXT")
+
+
+async def add_hot_path_indexes(engine: AsyncEngine) -> None:
+    # The same indexes are declared on the models, so a fresh database gets them
+    # from create_all; this step is what adds them to existing databases
+    await create_index(engine, "ix_survey_responses_employee_id_status", "survey_responses", "employee_id, status")
+    await create_index(
+        engine, "ix_survey_responses_survey_id_employee_id_status", "survey_responses", "survey_id, employee_id, status"
+    )
+    await create_index(engine, "ix_answers_question_id", "answers", "question_id")
+    await create_index(engine, "ix_questions_survey_id", "questions", "survey_id")
+    await create_index(engine, "ix_question_options_question_id", "question_options", "question_id")
+
+
+async def fill_answer_selected_options(engine: AsyncEngine) -> None:
+    # The table is created by init_db; copy option ids out of answers.answer_options.
+    # Only options of the answer's own question are copied, as analytics counts them
+    await backfill_by_key_ranges(
+        engine,
+        "answers",
+        "INSERT OR IGNORE INTO answer_selected_options (answer_id, option_id) "
+        "SELECT answers.id, question_options.id "
+        "FROM answers, json_each("
+        "CASE WHEN json_valid(answers.answer_options) THEN answers.answer_options ELSE '[]' END"
+        ") AS selected "
+        "JOIN question_options ON question_options.id = selected.value "
+        "AND question_options.question_id = answers.question_id "
+        "WHERE answers.id > :start AND answers.id <= :end AND answers.answer_options IS NOT NULL",
+    )
+
+
+MIGRATIONS = [
+    Migration(1, "employees.language", add_employee_language),
+    Migration(2, "employees.gender, employees.age", add_employee_gender_age),
+    Migration(3, "employees.branch, department, position", add_employee_org_fields),
+    Migration(4, "questions.question_text_ru, question_text_kg", add_question_languages),
+    Migration(5, "indexes for responses, answers, questions and options", add_hot_path_indexes),
+    Migration(6, "answer_selected_options from answers.answer_options", fill_answer_selected_options),
+]
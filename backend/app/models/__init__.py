@@ -1,6 +1,8 @@
 from app.models.employee import Employee
 from app.models.survey import Survey, Question, QuestionOption
-from app.models.response import SurveyResponse, Answer
+from app.models.response import SurveyResponse, Answer, AnswerSelectedOption
+from app.models.dispatch import SurveyDispatchState
+from app.models.reminder import ReminderJob
 
 __all__ = [
     "Employee",
@@ -9,4 +11,7 @@ __all__ = [
     "QuestionOption",
     "SurveyResponse",
     "Answer",
+    "AnswerSelectedOption",
+    "SurveyDispatchState",
+    "ReminderJob",
 ]
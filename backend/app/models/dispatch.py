@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class SurveyDispatchState(Base):
+    """Watermark of the automatic survey dispatch: the last day already processed."""
+    __tablename__ = "survey_dispatch_state"
+
+    survey_id = Column(Integer, ForeignKey("surveys.id", ondelete="CASCADE"), primary_key=True)
+    last_run_date = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
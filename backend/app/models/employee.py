@@ -24,4 +24,4 @@ class Employee(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    responses = relationship("SurveyResponse", back_populates="employee", cascade="all, delete-orphan")
+    responses = relationship("SurveyResponse", back_populates="employee", cascade="all, delete-orphan", passive_deletes=True)
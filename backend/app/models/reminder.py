@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ReminderJob(Base):
+    """Scheduled reminders for one survey response."""
+    __tablename__ = "reminder_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    response_id = Column(Integer, ForeignKey("survey_responses.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="pending")  # 'pending', 'sending', 'done', 'cancelled'
+    next_run_at = Column(DateTime, nullable=False)  # UTC
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Due jobs are always looked up by status and time
+        Index("ix_reminder_jobs_status_next_run_at", "status", "next_run_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -17,7 +17,15 @@ class SurveyResponse(Base):
     # Relationships
     survey = relationship("Survey", back_populates="responses")
     employee = relationship("Employee", back_populates="responses")
-    answers = relationship("Answer", back_populates="response", cascade="all, delete-orphan")
+    answers = relationship("Answer", back_populates="response", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Bot handlers: an employee's open responses
+        Index("ix_survey_responses_employee_id_status", "employee_id", "status"),
+        # Per-survey scans (results, analytics, exports) use the survey_id prefix;
+        # assignment checks look up (survey_id, employee_id) without touching the table
+        Index("ix_survey_responses_survey_id_employee_id_status", "survey_id", "employee_id", "status"),
+    )
 
 
 class Answer(Base):
@@ -25,10 +33,27 @@ class Answer(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     response_id = Column(Integer, ForeignKey("survey_responses.id", ondelete="CASCADE"), nullable=False, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
     answer_text = Column(Text, nullable=True)
     answer_options = Column(JSON, nullable=True)  # Array of option IDs for choice questions
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     response = relationship("SurveyResponse", back_populates="answers")
+    # The same option ids as answer_options, one row each, for indexed counts
+    selected_options = relationship(
+        "AnswerSelectedOption", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class AnswerSelectedOption(Base):
+    __tablename__ = "answer_selected_options"
+
+    answer_id = Column(Integer, ForeignKey("answers.id", ondelete="CASCADE"), primary_key=True)
+    option_id = Column(Integer, ForeignKey("question_options.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        # Analytics option counts and cross-filters read (option_id, answer_id)
+        # from the index alone; it also serves the cascade on option delete
+        Index("ix_answer_selected_options_option_id_answer_id", "option_id", "answer_id"),
+    )
@@ -16,15 +16,15 @@ class Survey(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    questions = relationship("Question", back_populates="survey", cascade="all, delete-orphan", order_by="Question.order_index")
-    responses = relationship("SurveyResponse", back_populates="survey", cascade="all, delete-orphan")
+    questions = relationship("Question", back_populates="survey", cascade="all, delete-orphan", passive_deletes=True, order_by="Question.order_index")
+    responses = relationship("SurveyResponse", back_populates="survey", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Question(Base):
     __tablename__ = "questions"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    survey_id = Column(Integer, ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
+    survey_id = Column(Integer, ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False, index=True)
     question_text = Column(Text, nullable=False)  # Default (RU)
     question_text_ru = Column(Text)  # Russian version
     question_text_kg = Column(Text)  # Kyrgyz version
@@ -35,14 +35,14 @@ class Question(Base):
 
     # Relationships
     survey = relationship("Survey", back_populates="questions")
-    options = relationship("QuestionOption", back_populates="question", cascade="all, delete-orphan", order_by="QuestionOption.order_index")
+    options = relationship("QuestionOption", back_populates="question", cascade="all, delete-orphan", passive_deletes=True, order_by="QuestionOption.order_index")
 
 
 class QuestionOption(Base):
     __tablename__ = "question_options"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
     option_text = Column(String(255), nullable=False)
     order_index = Column(Integer, nullable=False)
 
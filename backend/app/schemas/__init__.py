@@ -1,10 +1,24 @@
 from app.schemas.employee import Employee, EmployeeCreate, EmployeeUpdate, EmployeeList
-from app.schemas.survey import Survey, SurveyCreate, SurveyUpdate, SurveyList, Question, QuestionCreate, QuestionOption
+from app.schemas.survey import (
+    Survey,
+    SurveyCreate,
+    SurveyUpdate,
+    SurveyList,
+    SurveySummary,
+    SurveySummaryList,
+    Question,
+    QuestionCreate,
+    QuestionUpdate,
+    QuestionOption,
+    QuestionOptionUpdate,
+)
 from app.schemas.response import (
     SurveyResponse,
     SurveyResponseCreate,
     SurveyResults,
     ResponseList,
+    SurveyResponseSummary,
+    ResponseSummaryList,
     Answer,
     AnswerCreate,
     QuestionResult,
@@ -12,7 +26,9 @@ from app.schemas.response import (
     ResponseResult,
     SurveyAnalytics,
     QuestionAnalytics,
+    DetachJob,
 )
+from app.schemas.export import ExportJob
 from app.schemas.bot import (
     SurveyInviteRequest,
     SurveyReminderRequest,
@@ -33,15 +49,23 @@ __all__ = [
     "SurveyCreate",
     "SurveyUpdate",
     "SurveyList",
+    "SurveySummary",
+    "SurveySummaryList",
     "Question",
     "QuestionCreate",
+    "QuestionUpdate",
     "QuestionOption",
+    "QuestionOptionUpdate",
     "SurveyResponse",
     "SurveyResponseCreate",
     "SurveyResults",
     "ResponseList",
+    "SurveyResponseSummary",
+    "ResponseSummaryList",
     "ResponseResult",
     "Answer",
     "AnswerCreate",
     "QuestionResult",
+    "ExportJob",
+    "DetachJob",
 ]
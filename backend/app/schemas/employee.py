@@ -46,3 +46,4 @@ class Employee(EmployeeBase):
 class EmployeeList(BaseModel):
     employees: list[Employee]
     total: int
+    next_after_id: Optional[int] = None  # Cursor for keyset pagination
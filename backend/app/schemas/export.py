@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class ExportJob(BaseModel):
+    job_id: str
+    survey_id: int
+    status: str  # 'queued', 'running', 'completed', 'failed'
+    stage: Optional[str] = None  # 'fetching', 'building', 'done'
+    processed_rows: int = 0
+    total_rows: Optional[int] = None
+    progress: float = 0.0
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -79,6 +79,21 @@ class SurveyResults(BaseModel):
 class ResponseList(BaseModel):
     responses: List[SurveyResponse]
     total: int
+    next_after_id: Optional[int] = None  # Cursor for keyset pagination
+
+
+class SurveyResponseSummary(SurveyResponseBase):
+    """Response headline fields for list views, without nested answers."""
+    id: int
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    answers_count: int = 0
+
+
+class ResponseSummaryList(BaseModel):
+    responses: List[SurveyResponseSummary]
+    total: int
+    next_after_id: Optional[int] = None  # Cursor for keyset pagination
 
 
 # Analytics schemas
@@ -98,3 +113,15 @@ class SurveyAnalytics(BaseModel):
     completed_responses: int
     completion_rate: float
     question_analytics: List[QuestionAnalytics]
+
+
+class DetachJob(BaseModel):
+    job_id: str
+    survey_id: int
+    status: str  # 'queued', 'running', 'completed', 'failed'
+    deleted_count: int = 0
+    total_responses: Optional[int] = None
+    progress: float = 0.0
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -13,6 +13,10 @@ class QuestionOptionCreate(QuestionOptionBase):
     pass
 
 
+class QuestionOptionUpdate(QuestionOptionBase):
+    id: Optional[int] = None  # Existing option to edit in place; omit for a new option
+
+
 class QuestionOption(QuestionOptionBase):
     id: int
 
@@ -34,6 +38,11 @@ class QuestionCreate(QuestionBase):
     options: Optional[List[QuestionOptionCreate]] = []
 
 
+class QuestionUpdate(QuestionBase):
+    id: Optional[int] = None  # Existing question to edit in place; omit for a new question
+    options: Optional[List[QuestionOptionUpdate]] = []
+
+
 class Question(QuestionBase):
     id: int
     survey_id: int
@@ -60,7 +69,7 @@ class SurveyUpdate(BaseModel):
     description: Optional[str] = None
     days_after_start: Optional[int] = Field(None, ge=1)
     is_active: Optional[bool] = None
-    questions: Optional[List[QuestionCreate]] = None
+    questions: Optional[List[QuestionUpdate]] = None
 
 
 class Survey(SurveyBase):
@@ -76,3 +85,18 @@ class Survey(SurveyBase):
 class SurveyList(BaseModel):
     surveys: List[Survey]
     total: int
+    next_after_id: Optional[int] = None  # Cursor for keyset pagination
+
+
+class SurveySummary(SurveyBase):
+    """Survey headline fields for list views, without nested questions."""
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    questions_count: int = 0
+
+
+class SurveySummaryList(BaseModel):
+    surveys: List[SurveySummary]
+    total: int
+    next_after_id: Optional[int] = None  # Cursor for keyset pagination
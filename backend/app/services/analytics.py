@@ -0,0 +1,188 @@
+"""
+Агрегация аналитики по опросу.
+
+Распределение по вариантам считается в SQL по таблице answer_selected_options:
+count(*) по option_id читается из индекса, JSON answers.answer_options не
+разбирается. Кросс-фильтр (только ответы, где выбраны заданные варианты)
+сужает выборку тем же индексом.
+
+Как и раньше, учитывается только первый ответ анкеты на вопрос: повторные
+ответы (например, двойное нажатие кнопки) отбрасываются.
+"""
+from typing import Dict, List, Sequence
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Answer, AnswerSelectedOption, QuestionOption, SurveyResponse
+from app.services.read_models import SurveyDefinition
+
+CHOICE_TYPES = ("single_choice", "multiple_choice")
+
+
+def _response_criteria(survey_id: int, option_ids: Sequence[int]) -> list:
+    """Responses to the survey that selected every option in option_ids."""
+    criteria = [SurveyResponse.survey_id == survey_id]
+    for option_id in option_ids:
+        criteria.append(SurveyResponse.id.in_(
+            select(Answer.response_id)
+            .join(AnswerSelectedOption, AnswerSelectedOption.answer_id == Answer.id)
+            .where(AnswerSelectedOption.option_id == option_id)
+        ))
+    return criteria
+
+
+def _is_first_answer():
+    earlier = aliased(Answer)
+    return ~(
+        select(earlier.id)
+        .where(
+            earlier.response_id == Answer.response_id,
+            earlier.question_id == Answer.question_id,
+            earlier.id < Answer.id,
+        )
+        .exists()
+    )
+
+
+# Statements are built by separate functions so that scripts/check_query_plans.py
+# explains exactly the queries that run here
+
+def _count_responses_statement(survey_id: int, option_ids: Sequence[int] = ()) -> Select:
+    return select(func.count(SurveyResponse.id)).where(*_response_criteria(survey_id, option_ids))
+
+
+def _answer_totals_statement(survey_id: int, option_ids: Sequence[int] = ()) -> Select:
+    # Responses that answered each question, i.e. first answers
+    return (
+        select(Answer.question_id, func.count(Answer.response_id.distinct()))
+        .join(SurveyResponse, SurveyResponse.id == Answer.response_id)
+        .where(*_response_criteria(survey_id, option_ids))
+        .group_by(Answer.question_id)
+    )
+
+
+def _option_counts_statement(survey_id: int, survey_option_ids: List[int], option_ids: Sequence[int] = ()) -> Select:
+    statement = (
+        select(AnswerSelectedOption.option_id, func.count())
+        .join(Answer, Answer.id == AnswerSelectedOption.answer_id)
+        # An option is counted only for answers to its own question
+        .join(
+            QuestionOption,
+            (QuestionOption.id == AnswerSelectedOption.option_id)
+            & (QuestionOption.question_id == Answer.question_id),
+        )
+        .where(AnswerSelectedOption.option_id.in_(survey_option_ids), _is_first_answer())
+        .group_by(AnswerSelectedOption.option_id)
+    )
+    if option_ids:
+        statement = statement.join(SurveyResponse, SurveyResponse.id == Answer.response_id).where(
+            *_response_criteria(survey_id, option_ids)
+        )
+    return statement
+
+
+def _text_responses_statement(survey_id: int, question_ids: List[int], option_ids: Sequence[int] = ()) -> Select:
+    return (
+        select(Answer.question_id, Answer.answer_text)
+        .join(SurveyResponse, SurveyResponse.id == Answer.response_id)
+        .where(
+            *_response_criteria(survey_id, option_ids),
+            Answer.question_id.in_(question_ids),
+            _is_first_answer(),
+        )
+        .order_by(SurveyResponse.id, Answer.id)
+    )
+
+
+async def count_responses(db: AsyncSession, survey_id: int, option_ids: Sequence[int] = ()) -> int:
+    result = await db.execute(_count_responses_statement(survey_id, option_ids))
+    return result.scalar() or 0
+
+
+async def _answer_totals(db: AsyncSession, survey_id: int, option_ids: Sequence[int]) -> Dict[int, int]:
+    result = await db.execute(_answer_totals_statement(survey_id, option_ids))
+    return dict(result.all())
+
+
+async def _option_counts(
+    db: AsyncSession,
+    survey_id: int,
+    survey_option_ids: List[int],
+    option_ids: Sequence[int],
+) -> Dict[int, int]:
+    if not survey_option_ids:
+        return {}
+    result = await db.execute(_option_counts_statement(survey_id, survey_option_ids, option_ids))
+    return dict(result.all())
+
+
+async def _text_responses(
+    db: AsyncSession,
+    survey_id: int,
+    question_ids: List[int],
+    option_ids: Sequence[int],
+) -> Dict[int, List[str]]:
+    if not question_ids:
+        return {}
+    result = await db.execute(_text_responses_statement(survey_id, question_ids, option_ids))
+    texts: Dict[int, List[str]] = {}
+    for question_id, answer_text in result:
+        if answer_text:
+            texts.setdefault(question_id, []).append(answer_text)
+    return texts
+
+
+async def load_question_analytics(
+    db: AsyncSession,
+    survey: SurveyDefinition,
+    option_ids: Sequence[int] = (),
+) -> List[dict]:
+    """
+    Build per-question analytics: option distribution for choice questions
+    and the list of text responses for text questions.
+
+    With option_ids, only responses that selected all of those options are counted.
+    """
+    choice_option_ids = [
+        option.id
+        for question in survey.questions
+        if question.question_type in CHOICE_TYPES
+        for option in question.options
+    ]
+    text_question_ids = [question.id for question in survey.questions if question.question_type == "text"]
+
+    answer_totals = await _answer_totals(db, survey.id, option_ids)
+    option_counts = await _option_counts(db, survey.id, choice_option_ids, option_ids)
+    text_responses = await _text_responses(db, survey.id, text_question_ids, option_ids)
+
+    analytics = []
+    for question in survey.questions:
+        total_answers = answer_totals.get(question.id, 0)
+        item = {
+            "question_id": question.id,
+            "question_text": question.question_text,
+            "question_type": question.question_type,
+            "total_answers": total_answers,
+        }
+
+        if question.question_type in CHOICE_TYPES:
+            distribution = []
+            for option in question.options:
+                count = option_counts.get(option.id, 0)
+                percentage = (count / total_answers * 100) if total_answers else 0
+                distribution.append({
+                    "option_id": option.id,
+                    "option": option.option_text,
+                    "count": count,
+                    "percentage": round(percentage, 2)
+                })
+            item["choice_distribution"] = distribution
+
+        elif question.question_type == "text":
+            item["text_responses"] = text_responses.get(question.id, [])
+
+        analytics.append(item)
+
+    return analytics
@@ -0,0 +1,84 @@
+"""
+Массовое назначение опросов сотрудникам.
+
+Назначение выполняется одним INSERT ... SELECT: в survey_responses
+добавляются строки pending для всех подходящих сотрудников, у которых
+ещё нет ответа на этот опрос. Приглашения затем ставятся в очередь
+исходящих сообщений пачками.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select, insert, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bot.services.notification_service import format_survey_invite
+from app.bot.services.outbox import OutboundMessage, outbox
+from app.config import settings
+from app.database import read_session
+from app.models import Employee, Survey, SurveyResponse
+from app.services.reminders import schedule_reminders
+
+
+def eligible_employee_criteria(survey: Survey, today: Optional[date] = None) -> list:
+    """Active employees who started at least days_after_start days ago."""
+    cutoff_date = (today or date.today()) - timedelta(days=survey.days_after_start)
+    return [Employee.start_date <= cutoff_date, Employee.is_active == True]
+
+
+async def bulk_assign_survey(db: AsyncSession, survey_id: int, *criteria) -> List[int]:
+    """
+    Create pending responses for employees matching criteria who have none for the survey.
+
+    Reminders are scheduled for the new responses in the same transaction.
+    Returns ids of the employees that were assigned. The caller commits.
+    """
+    has_response = (
+        select(SurveyResponse.id)
+        .where(
+            SurveyResponse.survey_id == survey_id,
+            SurveyResponse.employee_id == Employee.id
+        )
+        .exists()
+    )
+    candidates = (
+        select(literal(survey_id), Employee.id, literal("pending"))
+        .where(*criteria, ~has_response)
+    )
+    result = await db.execute(
+        insert(SurveyResponse)
+        .from_select(["survey_id", "employee_id", "status"], candidates)
+        .returning(SurveyResponse.id, SurveyResponse.employee_id)
+    )
+    created = result.all()
+    await schedule_reminders(db, [response_id for response_id, _ in created])
+    return [employee_id for _, employee_id in created]
+
+
+async def enqueue_survey_invites(survey: Survey, employee_ids: List[int]) -> int:
+    """
+    Queue invites for the given employees in batches; returns the number queued.
+
+    Recipients are read from the read pool, so the write connection isn't held
+    while waiting for room in the outbox queue.
+    """
+    if not outbox.running:
+        return 0
+
+    queued = 0
+    batch_size = settings.INVITE_BATCH_SIZE
+    for start in range(0, len(employee_ids), batch_size):
+        batch = employee_ids[start:start + batch_size]
+        async with read_session() as db:
+            result = await db.execute(
+                select(Employee.telegram_id, Employee.first_name).where(Employee.id.in_(batch))
+            )
+            recipients = result.all()
+        queued += await outbox.put_many(
+            OutboundMessage(
+                chat_id=telegram_id,
+                text=format_survey_invite(first_name, survey.title, survey.description),
+            )
+            for telegram_id, first_name in recipients
+        )
+    return queued
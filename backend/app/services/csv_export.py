@@ -0,0 +1,57 @@
+"""
+Потоковая выгрузка результатов опроса в CSV.
+
+Колонки совпадают с Excel-выгрузкой. Строки кодируются и отправляются
+клиенту по мере чтения из БД, при необходимости сжимаются gzip на лету.
+"""
+import csv
+import io
+import zlib
+from typing import AsyncIterator
+
+from app.database import read_session
+from app.services.excel_export import build_headers, iter_result_rows
+from app.services.read_models import SurveyDefinition
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+# Сколько строк накапливать перед отправкой очередного куска
+FLUSH_ROWS = 200
+GZIP_LEVEL = 5
+
+
+async def iter_csv_chunks(survey: SurveyDefinition, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Yield the CSV export of a survey in chunks.
+
+    Opens its own read session: the request session is already closed by the
+    time a streaming response body is produced.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # wbits=31 produces a gzip container instead of a raw zlib stream
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    def take() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    writer.writerow(build_headers(survey))
+
+    async with read_session() as db:
+        rows = 0
+        async for row in iter_result_rows(db, survey):
+            writer.writerow(row)
+            rows += 1
+            if rows % FLUSH_ROWS == 0:
+                chunk = take()
+                if chunk:
+                    yield chunk
+
+    chunk = take()
+    if compressor:
+        chunk += compressor.flush()
+    yield chunk
@@ -0,0 +1,57 @@
+"""
+Фоновое открепление опроса от всех сотрудников.
+
+Ответы удаляются пачками по DETACH_CHUNK_SIZE, каждая пачка в отдельной
+короткой транзакции; ответы на вопросы и напоминания удаляются каскадно
+(ON DELETE CASCADE). Между пачками блокировка записи SQLite освобождается,
+поэтому запись ответов ботом не ждёт окончания всей операции.
+"""
+import asyncio
+
+from sqlalchemy import select, delete, func
+
+from app.config import settings
+from app.database import async_session
+from app.models import SurveyResponse
+from app.services.jobs import Job, jobs
+
+DETACH_JOB = "survey_detach"
+
+# Пауза между пачками, чтобы ожидающие записи успели захватить блокировку
+CHUNK_PAUSE_SECONDS = 0.05
+
+
+async def _run_detach_job(job: Job) -> dict:
+    survey_id = job.params["survey_id"]
+
+    async with async_session() as db:
+        total_result = await db.execute(
+            select(func.count(SurveyResponse.id)).where(SurveyResponse.survey_id == survey_id)
+        )
+        job.total = total_result.scalar() or 0
+        job.stage = "deleting"
+
+        while True:
+            chunk = (
+                select(SurveyResponse.id)
+                .where(SurveyResponse.survey_id == survey_id)
+                .order_by(SurveyResponse.id)
+                .limit(settings.DETACH_CHUNK_SIZE)
+            )
+            result = await db.execute(delete(SurveyResponse).where(SurveyResponse.id.in_(chunk)))
+            await db.commit()
+            if not result.rowcount:
+                break
+            job.processed += result.rowcount
+            await asyncio.sleep(CHUNK_PAUSE_SECONDS)
+
+    job.stage = "done"
+    return {"deleted_count": job.processed}
+
+
+def submit_detach_job(survey_id: int) -> Job:
+    """Start detaching a survey, reusing a running job for the same survey."""
+    existing = jobs.find_active(DETACH_JOB, survey_id=survey_id)
+    if existing:
+        return existing
+    return jobs.submit(DETACH_JOB, _run_detach_job, survey_id=survey_id)
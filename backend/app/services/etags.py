@@ -0,0 +1,40 @@
+"""
+Условные GET-запросы (ETag / If-None-Match).
+
+ETag строится из версии данных (app.services.versions), поэтому проверка
+выполняется до загрузки и сериализации ответа.
+"""
+from fastapi import Request, Response, status
+
+
+def make_etag(version: str) -> str:
+    """Weak ETag: the same data may be serialized or compressed differently."""
+    return f'W/"{version}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Weak comparison against every tag listed in If-None-Match."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    expected = _opaque(etag)
+    return any(_opaque(tag) == expected for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the ETag and ask clients to revalidate before reusing their copy."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
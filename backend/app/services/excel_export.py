@@ -0,0 +1,287 @@
+"""
+Потоковая выгрузка результатов опроса в Excel.
+
+Строки читаются из БД курсором и пачками сбрасываются во временный файл,
+после чего write-only книга openpyxl строится в пуле процессов отчётов.
+В памяти никогда не находится вся выгрузка целиком, а event loop не
+занят построением книги.
+"""
+import os
+import pickle
+import tempfile
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import SurveyResponse, Answer, Employee
+from app.services.read_models import SurveyDefinition
+from app.services.report_pool import run_report_job
+
+SHEET_TITLE = "Результаты опроса"
+BASE_HEADERS = ["№", "Сотрудник", "Telegram Username", "Дата завершения"]
+
+# Ширина колонок оценивается по первым строкам выгрузки
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 50
+# Сколько строк забирать из курсора БД за один раз
+DB_FETCH_SIZE = 500
+# Сколько строк передаётся воркеру одной пачкой
+ROWS_BATCH_SIZE = 500
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center", wrap_text=True)
+CELL_ALIGNMENT = Alignment(vertical="center", wrap_text=True)
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+
+def build_headers(survey: SurveyDefinition) -> List[str]:
+    """Header row: fixed employee columns plus one column per question."""
+    return BASE_HEADERS + [question.question_text for question in survey.questions]
+
+
+def _format_answer(question, answer_text: Optional[str], answer_options: Optional[list], option_texts: dict) -> str:
+    """Render a single answer cell the same way for every export format."""
+    if question.question_type == "text":
+        return answer_text or "-"
+    if question.question_type in ("single_choice", "multiple_choice"):
+        if answer_options:
+            texts = [option_texts[option_id] for option_id in answer_options if option_id in option_texts]
+            return ", ".join(texts) if texts else "-"
+    return "-"
+
+
+async def iter_result_rows(db: AsyncSession, survey: SurveyDefinition) -> AsyncIterator[list]:
+    """
+    Yield export rows for a survey as the DB cursor produces them.
+
+    One flat query of (response, employee, answer) ordered by response id is
+    grouped into rows on the fly, so only the current response is held in memory.
+    """
+    questions = survey.questions
+    option_texts = {
+        option_id: option_text
+        for question in questions
+        for option_id, option_text in question.option_texts.items()
+    }
+
+    result = await db.stream(
+        select(
+            SurveyResponse.id,
+            SurveyResponse.completed_at,
+            Employee.first_name,
+            Employee.last_name,
+            Employee.telegram_username,
+            Answer.question_id,
+            Answer.answer_text,
+            Answer.answer_options,
+        )
+        .join(Employee, Employee.id == SurveyResponse.employee_id)
+        .outerjoin(Answer, Answer.response_id == SurveyResponse.id)
+        .where(SurveyResponse.survey_id == survey.id)
+        .order_by(SurveyResponse.id, Answer.id)
+        .execution_options(yield_per=DB_FETCH_SIZE)
+    )
+
+    def build_row(idx, head, answers):
+        _, completed_at, first_name, last_name, username = head
+        row = [
+            idx,
+            f"{last_name or ''} {first_name or ''}".strip() or "-",
+            username or "-",
+            completed_at.strftime("%d.%m.%Y %H:%M") if completed_at else "Не завершено",
+        ]
+        for question in questions:
+            answer = answers.get(question.id)
+            if answer:
+                row.append(_format_answer(question, answer[0], answer[1], option_texts))
+            else:
+                row.append("-")
+        return row
+
+    idx = 0
+    head = None
+    answers = {}
+    async for response_id, completed_at, first_name, last_name, username, question_id, answer_text, answer_options in result:
+        if head is None or head[0] != response_id:
+            if head is not None:
+                idx += 1
+                yield build_row(idx, head, answers)
+            head = (response_id, completed_at, first_name, last_name, username)
+            answers = {}
+        if question_id is not None:
+            # Keep the first answer per question, as the bot never stores more
+            answers.setdefault(question_id, (answer_text, answer_options))
+
+    if head is not None:
+        yield build_row(idx + 1, head, answers)
+
+
+class SurveyResultsWorkbook:
+    """
+    Write-only workbook for survey results.
+
+    The first WIDTH_SAMPLE_ROWS rows are buffered to estimate column widths,
+    which write-only sheets require before the first row is written; after
+    that every row goes straight to the sheet stream.
+    """
+
+    def __init__(self, headers: List[str]):
+        self.headers = headers
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(title=SHEET_TITLE)
+        self.rows_written = 0
+        self._sample: Optional[List[list]] = []
+
+    def append(self, row: list) -> None:
+        if self._sample is not None:
+            self._sample.append(row)
+            if len(self._sample) >= WIDTH_SAMPLE_ROWS:
+                self._start()
+            return
+        self._write_row(row)
+
+    def extend(self, rows: Iterable[list]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def save(self, fileobj) -> None:
+        if self._sample is not None:
+            self._start()
+        self.workbook.save(fileobj)
+
+    def _start(self) -> None:
+        sample, self._sample = self._sample, None
+
+        widths = [len(str(header)) for header in self.headers]
+        for row in sample:
+            for col, value in enumerate(row):
+                if col < len(widths):
+                    widths[col] = max(widths[col], len(str(value)))
+        for col, width in enumerate(widths, 1):
+            self.sheet.column_dimensions[get_column_letter(col)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+        # Freeze header row
+        self.sheet.freeze_panes = "A2"
+
+        header_cells = []
+        for value in self.headers:
+            cell = WriteOnlyCell(self.sheet, value=value)
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            cell.alignment = HEADER_ALIGNMENT
+            cell.border = THIN_BORDER
+            header_cells.append(cell)
+        self.sheet.append(header_cells)
+
+        for row in sample:
+            self._write_row(row)
+
+    def _write_row(self, row: list) -> None:
+        cells = []
+        for value in row:
+            cell = WriteOnlyCell(self.sheet, value=value)
+            cell.alignment = CELL_ALIGNMENT
+            cell.border = THIN_BORDER
+            cells.append(cell)
+        self.sheet.append(cells)
+        self.rows_written += 1
+
+
+def build_workbook_file(headers: List[str], rows_path: str, output_path: str) -> int:
+    """
+    Build the xlsx file from spooled row batches. Runs in the report pool.
+
+    Returns the number of data rows written.
+    """
+    workbook = SurveyResultsWorkbook(headers)
+    with open(rows_path, "rb") as rows_file:
+        while True:
+            try:
+                batch = pickle.load(rows_file)
+            except EOFError:
+                break
+            workbook.extend(batch)
+    workbook.save(output_path)
+    return workbook.rows_written
+
+
+def _temp_path(suffix: str) -> str:
+    fd, path = tempfile.mkstemp(prefix="hrbot_export_", suffix=suffix)
+    os.close(fd)
+    return path
+
+
+def remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def spool_result_rows(
+    db: AsyncSession,
+    survey: SurveyDefinition,
+    rows_path: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Write export rows to disk as pickled batches of compact tuples."""
+    total = 0
+    batch = []
+    with open(rows_path, "wb") as rows_file:
+        async for row in iter_result_rows(db, survey):
+            batch.append(tuple(row))
+            if len(batch) >= ROWS_BATCH_SIZE:
+                pickle.dump(batch, rows_file, protocol=pickle.HIGHEST_PROTOCOL)
+                total += len(batch)
+                batch = []
+                if on_progress:
+                    on_progress(total)
+        if batch:
+            pickle.dump(batch, rows_file, protocol=pickle.HIGHEST_PROTOCOL)
+            total += len(batch)
+    if on_progress:
+        on_progress(total)
+    return total
+
+
+async def export_survey_workbook(
+    db: AsyncSession,
+    survey: SurveyDefinition,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+) -> str:
+    """
+    Export survey results into a temporary xlsx file and return its path.
+
+    Rows are fetched on the event loop, the workbook is built in the report
+    pool. on_progress(stage, rows) is called while rows are fetched and once
+    the build starts. The caller owns the returned file and must remove it.
+    """
+    rows_path = _temp_path(".rows")
+    output_path = _temp_path(".xlsx")
+    try:
+        fetched = await spool_result_rows(
+            db, survey, rows_path,
+            on_progress=(lambda rows: on_progress("fetching", rows)) if on_progress else None,
+        )
+        if on_progress:
+            on_progress("building", fetched)
+        await run_report_job(build_workbook_file, build_headers(survey), rows_path, output_path)
+    except BaseException:
+        remove_file(output_path)
+        raise
+    finally:
+        remove_file(rows_path)
+    return output_path
@@ -0,0 +1,120 @@
+"""
+Дисковый кэш готовых выгрузок.
+
+Файл выгрузки хранится под ключом (survey_id, версия данных), поэтому
+повторная выгрузка неизменившегося опроса отдаётся прямо с диска.
+Старые файлы вытесняются по возрасту и суммарному размеру кэша.
+
+Файл может быть удалён в любой момент (новая версия опроса, вытеснение),
+поэтому для отдачи его открывают через open_file: открытый дескриптор
+остаётся читаемым и после удаления файла.
+"""
+import logging
+import os
+import time
+from typing import BinaryIO, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExportCache:
+    """Directory of finished export files with age and size based eviction."""
+
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+    def _prefix(self, survey_id: int, kind: str) -> str:
+        return f"survey_{survey_id}_{kind}_"
+
+    def path_for(self, survey_id: int, version: str, kind: str = "xlsx") -> str:
+        return os.path.join(self.directory, f"{self._prefix(survey_id, kind)}{version}.{kind}")
+
+    def get(self, survey_id: int, version: str, kind: str = "xlsx") -> Optional[str]:
+        """Return the cached file path if present and not expired."""
+        path = self.path_for(survey_id, version, kind)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if time.time() - stat.st_mtime > self.max_age_seconds:
+            self._remove(path)
+            return None
+        # mtime stays the build time (age), atime tracks the last download (LRU)
+        os.utime(path, (time.time(), stat.st_mtime))
+        return path
+
+    def open_file(self, survey_id: int, version: str, kind: str = "xlsx") -> Optional[BinaryIO]:
+        """Open the cached file for reading; None on a miss, including a file removed meanwhile."""
+        path = self.get(survey_id, version, kind)
+        if path is None:
+            return None
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+    def put(self, survey_id: int, version: str, source_path: str, kind: str = "xlsx") -> str:
+        """Move a finished file into the cache, replacing older versions of the same survey."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(survey_id, version, kind)
+        os.replace(source_path, path)
+
+        prefix = self._prefix(survey_id, kind)
+        for name in os.listdir(self.directory):
+            other = os.path.join(self.directory, name)
+            if name.startswith(prefix) and other != path:
+                self._remove(other)
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """
+        Remove expired files, then the least recently used ones until under the size limit.
+
+        The keep file is never removed, so a file just put can be opened by its requesters.
+        """
+        if not os.path.isdir(self.directory):
+            return
+
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == keep:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                self._remove(path)
+            else:
+                entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove cached export {path}: {e}")
+
+
+export_cache = ExportCache(
+    directory=settings.EXPORT_CACHE_DIR,
+    max_bytes=settings.EXPORT_CACHE_MAX_MB * 1024 * 1024,
+    max_age_seconds=settings.EXPORT_CACHE_MAX_AGE_HOURS * 3600,
+)
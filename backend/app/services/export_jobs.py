@@ -0,0 +1,92 @@
+"""
+Фоновые задачи выгрузки результатов опроса.
+
+POST создаёт задачу и сразу возвращает её id, прогресс можно опрашивать.
+Готовый файл кладётся в дисковый кэш по ключу (опрос, версия данных), и
+все последующие скачивания неизменившегося опроса отдаются из кэша.
+"""
+from typing import BinaryIO, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import read_session
+from app.models import Survey, SurveyResponse
+from app.services.excel_export import export_survey_workbook
+from app.services.export_cache import export_cache
+from app.services.jobs import Job, jobs
+from app.services.read_models import SurveyDefinition, load_survey_definition
+from app.services.singleflight import single_flight
+
+EXPORT_JOB = "survey_export"
+# Сколько раз собирать выгрузку, если файл удаляют из кэша до отдачи
+OPEN_ATTEMPTS = 3
+
+
+async def build_cached_export(db: AsyncSession, survey: SurveyDefinition, version: str, job: Optional[Job] = None) -> str:
+    """Build the xlsx for a survey version and store it in the export cache."""
+    def on_progress(stage: str, rows: int) -> None:
+        job.stage = stage
+        job.processed = rows
+
+    tmp_path = await export_survey_workbook(db, survey, on_progress=on_progress if job else None)
+    return export_cache.put(survey.id, version, tmp_path)
+
+
+async def _load_survey(db: AsyncSession, survey_id: int) -> SurveyDefinition:
+    survey = await load_survey_definition(db, survey_id)
+    if not survey:
+        raise ValueError("Survey not found")
+    return survey
+
+
+async def _build_export(survey_id: int, version: str) -> str:
+    async with read_session() as db:
+        survey = await _load_survey(db, survey_id)
+        return await build_cached_export(db, survey, version)
+
+
+async def open_cached_export(survey_id: int, version: str) -> BinaryIO:
+    """
+    Open the xlsx for a survey version; concurrent requests share one build.
+
+    A file removed between the build and the open (a newer version was put,
+    or eviction) counts as a miss and is built again.
+    """
+    for _ in range(OPEN_ATTEMPTS):
+        file = export_cache.open_file(survey_id, version)
+        if file is not None:
+            return file
+        await single_flight.run(
+            ("export", survey_id, version),
+            lambda: _build_export(survey_id, version),
+            cache=False,
+        )
+    raise RuntimeError(f"Export of survey {survey_id} was removed from the cache before it could be sent")
+
+
+async def _run_export_job(job: Job) -> dict:
+    survey_id = job.params["survey_id"]
+    version = job.params["version"]
+
+    path = export_cache.get(survey_id, version)
+    if path is None:
+        async with read_session() as db:
+            survey = await _load_survey(db, survey_id)
+
+            total_result = await db.execute(
+                select(func.count(SurveyResponse.id)).where(SurveyResponse.survey_id == survey_id)
+            )
+            job.total = total_result.scalar() or 0
+            path = await build_cached_export(db, survey, version, job)
+
+    job.stage = "done"
+    return {"path": path}
+
+
+def submit_export_job(survey_id: int, version: str) -> Job:
+    """Start an export job, reusing a running one for the same survey version."""
+    existing = jobs.find_active(EXPORT_JOB, survey_id=survey_id, version=version)
+    if existing:
+        return existing
+    return jobs.submit(EXPORT_JOB, _run_export_job, survey_id=survey_id, version=version)
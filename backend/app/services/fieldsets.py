@@ -0,0 +1,41 @@
+"""
+Разреженные наборы полей (sparse fieldsets) для ответов API.
+
+Параметр ``fields=id,title,...`` сужает и SQL-проекцию, и сериализацию.
+Ответ с выбранными полями отдаётся напрямую, минуя response_model,
+который описывает полный объект.
+"""
+from typing import Any, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+
+from app.services.json_response import FastJSONResponse
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], always: Iterable[str] = ("id",)) -> Optional[List[str]]:
+    """
+    Parse a comma-separated fields parameter.
+
+    Returns None when no narrowing was requested, otherwise the requested
+    fields plus the always-included ones, ordered as in ``allowed``.
+    Unknown fields are a 400 error.
+    """
+    if not fields:
+        return None
+
+    allowed = list(allowed)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    requested.update(name for name in always if name in allowed)
+    return [name for name in allowed if name in requested]
+
+
+def fieldset_response(content: Any) -> FastJSONResponse:
+    """Serialize a narrowed payload (dicts, rows, dates) without response_model validation."""
+    return FastJSONResponse(content)
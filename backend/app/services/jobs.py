@@ -0,0 +1,110 @@
+"""
+Реестр фоновых задач (выгрузки, массовые операции).
+
+Задачи живут в памяти процесса: после перезапуска сервера их статус
+теряется, но результаты, сохранённые на диск (например, кэш выгрузок),
+остаются доступны.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = JOB_QUEUED
+    stage: Optional[str] = None
+    processed: int = 0
+    total: Optional[int] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    @property
+    def progress(self) -> float:
+        if self.status == JOB_COMPLETED:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.processed / self.total, 1.0)
+
+
+class JobRegistry:
+    """Keeps the most recent jobs and runs them as asyncio tasks."""
+
+    def __init__(self, max_jobs: int = 200):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def find_active(self, kind: str, **params) -> Optional[Job]:
+        """Find an unfinished job of the given kind with matching params."""
+        for job in reversed(self._jobs.values()):
+            if job.kind == kind and not job.is_finished and job.params == params:
+                return job
+        return None
+
+    def submit(self, kind: str, runner: Callable[[Job], Awaitable[Dict[str, Any]]], **params) -> Job:
+        """Register a job and start it in the background."""
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params)
+        self._jobs[job.id] = job
+        self._trim()
+        self._tasks[job.id] = asyncio.create_task(self._run(job, runner))
+        return job
+
+    async def _run(self, job: Job, runner: Callable[[Job], Awaitable[Dict[str, Any]]]) -> None:
+        job.status = JOB_RUNNING
+        try:
+            job.result = await runner(job) or {}
+            job.status = JOB_COMPLETED
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.kind} {job.id} failed: {e}", exc_info=True)
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._tasks.pop(job.id, None)
+
+    def _trim(self) -> None:
+        """Drop the oldest finished jobs once the registry is full."""
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].is_finished:
+                del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+jobs = JobRegistry()
@@ -0,0 +1,32 @@
+"""
+Быстрая сериализация ответов API.
+
+Эндпоинты с большими ответами (результаты, аналитика) возвращают
+FastJSONResponse с уже собранной Pydantic-моделью: FastAPI не проверяет её
+повторно через response_model, а JSON формируется сериализатором
+pydantic-core за один проход.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+def render_json(content: Any) -> bytes:
+    """Render a model or a plain payload the same way the default encoder would."""
+    if isinstance(content, BaseModel):
+        # Already validated on construction: serialize without another pass
+        return content.__pydantic_serializer__.to_json(content)
+    # Plain payloads (dicts, rows, dates, nested models) of sparse fieldsets
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core; the output matches the default encoder."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            # Already rendered, e.g. shared between coalesced requests
+            return content
+        return render_json(content)
@@ -0,0 +1,46 @@
+"""
+Пагинация списков: offset (skip/limit) и keyset (after_id/limit), а также
+подсчёт общего количества через SELECT COUNT(*) с опциональным кэшем.
+"""
+from typing import Hashable, Optional, Sequence
+
+from sqlalchemy import Select, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.cache import MISSING, TTLCache
+
+_count_cache = TTLCache(ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def paginate(query: Select, id_column, skip: int, limit: int, after_id: Optional[int] = None) -> Select:
+    """
+    Order by id and apply either keyset (after_id) or offset (skip) pagination.
+
+    Keyset pages are an index range scan, so deep pages cost the same as the first one.
+    """
+    if after_id is not None:
+        query = query.where(id_column > after_id)
+    else:
+        query = query.offset(skip)
+    return query.order_by(id_column).limit(limit)
+
+
+def next_after_id(items: Sequence, limit: int) -> Optional[int]:
+    """Cursor for the next keyset page, or None if this page is the last one."""
+    if limit and len(items) >= limit:
+        return items[-1].id
+    return None
+
+
+async def count_total(db: AsyncSession, model, *criteria, cache_key: Hashable = None) -> int:
+    """SELECT COUNT(*) for a model with optional filters, cached for COUNT_CACHE_TTL_SECONDS."""
+    key = (model.__tablename__, cache_key)
+    total = _count_cache.get(key)
+    if total is not MISSING:
+        return total
+
+    result = await db.execute(select(func.count()).select_from(model).where(*criteria))
+    total = result.scalar() or 0
+    _count_cache.set(key, total)
+    return total
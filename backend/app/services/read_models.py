@@ -0,0 +1,269 @@
+"""
+Модели чтения для результатов опросов и выгрузок.
+
+Результаты опроса, ответы сотрудника и выгрузки читаются плоскими
+Core-запросами в небольшие объекты со __slots__, без ORM-сущностей: нет
+identity map, отслеживания изменений и загрузки связей. Выходные
+Pydantic-модели собираются через model_construct без повторной валидации:
+типы значений уже гарантированы схемой БД.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Answer, Employee, Question, QuestionOption, Survey, SurveyResponse
+from app.schemas import EmployeeResult, QuestionResult, ResponseResult
+
+
+class OptionInfo:
+    __slots__ = ("id", "option_text")
+
+    def __init__(self, id: int, option_text: str):
+        self.id = id
+        self.option_text = option_text
+
+
+class QuestionInfo:
+    __slots__ = ("id", "question_text", "question_type", "options", "option_texts")
+
+    def __init__(self, id: int, question_text: str, question_type: str):
+        self.id = id
+        self.question_text = question_text
+        self.question_type = question_type
+        self.options: List[OptionInfo] = []
+        self.option_texts: Dict[int, str] = {}
+
+    def add_option(self, option_id: int, option_text: str) -> None:
+        self.options.append(OptionInfo(option_id, option_text))
+        self.option_texts[option_id] = option_text
+
+
+class SurveyDefinition:
+    """A survey with its questions and options, in the order of the ORM relationships."""
+
+    __slots__ = ("id", "title", "days_after_start", "questions", "questions_by_id")
+
+    def __init__(self, id: int, title: str, days_after_start: Optional[int]):
+        self.id = id
+        self.title = title
+        self.days_after_start = days_after_start
+        self.questions: List[QuestionInfo] = []
+        self.questions_by_id: Dict[int, QuestionInfo] = {}
+
+
+class EmployeeInfo:
+    __slots__ = ("id", "telegram_id", "telegram_username", "first_name", "last_name")
+
+    def __init__(self, id, telegram_id, telegram_username, first_name, last_name):
+        self.id = id
+        self.telegram_id = telegram_id
+        self.telegram_username = telegram_username
+        self.first_name = first_name
+        self.last_name = last_name
+
+
+class AnswerInfo:
+    __slots__ = ("question_id", "answer_text", "answer_options")
+
+    def __init__(self, question_id: int, answer_text: Optional[str], answer_options: Optional[list]):
+        self.question_id = question_id
+        self.answer_text = answer_text
+        self.answer_options = answer_options
+
+
+class ResponseInfo:
+    __slots__ = ("id", "survey_id", "completed_at", "employee", "answers")
+
+    def __init__(self, id: int, survey_id: int, completed_at: Optional[datetime], employee: Optional[EmployeeInfo]):
+        self.id = id
+        self.survey_id = survey_id
+        self.completed_at = completed_at
+        self.employee = employee
+        self.answers: List[AnswerInfo] = []
+
+
+_EMPLOYEE_COLUMNS = (
+    Employee.id,
+    Employee.telegram_id,
+    Employee.telegram_username,
+    Employee.first_name,
+    Employee.last_name,
+)
+
+
+# Statements are built by separate functions so that scripts/check_query_plans.py
+# explains exactly the queries that run here
+
+def _questions_statement(survey_ids: List[int]) -> Select:
+    return (
+        select(
+            Question.survey_id,
+            Question.id,
+            Question.question_text,
+            Question.question_type,
+            QuestionOption.id,
+            QuestionOption.option_text,
+        )
+        .outerjoin(QuestionOption, QuestionOption.question_id == Question.id)
+        .where(Question.survey_id.in_(survey_ids))
+        .order_by(Question.order_index, Question.id, QuestionOption.order_index, QuestionOption.id)
+    )
+
+
+def _answers_statement(*criteria) -> Select:
+    return (
+        select(Answer.response_id, Answer.question_id, Answer.answer_text, Answer.answer_options)
+        .join(SurveyResponse, SurveyResponse.id == Answer.response_id)
+        .where(*criteria)
+        .order_by(SurveyResponse.id, Answer.id)
+    )
+
+
+def _survey_responses_statement(survey_id: int, with_employee: bool) -> Select:
+    statement = (
+        select(SurveyResponse.id, SurveyResponse.survey_id, SurveyResponse.completed_at)
+        .where(SurveyResponse.survey_id == survey_id)
+        .order_by(SurveyResponse.id)
+    )
+    if with_employee:
+        statement = statement.add_columns(*_EMPLOYEE_COLUMNS).join(
+            Employee, Employee.id == SurveyResponse.employee_id
+        )
+    return statement
+
+
+def _employee_responses_statement(employee_id: int) -> Select:
+    return (
+        select(SurveyResponse.id, SurveyResponse.survey_id, SurveyResponse.completed_at)
+        .where(SurveyResponse.employee_id == employee_id)
+        .order_by(SurveyResponse.id)
+    )
+
+
+async def load_survey_definitions(db: AsyncSession, survey_ids: Iterable[int]) -> Dict[int, SurveyDefinition]:
+    """Survey definitions by id, two queries regardless of the number of surveys."""
+    survey_ids = list(survey_ids)
+    if not survey_ids:
+        return {}
+
+    surveys_result = await db.execute(
+        select(Survey.id, Survey.title, Survey.days_after_start).where(Survey.id.in_(survey_ids))
+    )
+    surveys = {row[0]: SurveyDefinition(*row) for row in surveys_result}
+
+    questions_result = await db.execute(_questions_statement(survey_ids))
+    for survey_id, question_id, question_text, question_type, option_id, option_text in questions_result:
+        survey = surveys[survey_id]
+        question = survey.questions_by_id.get(question_id)
+        if question is None:
+            question = QuestionInfo(question_id, question_text, question_type)
+            survey.questions.append(question)
+            survey.questions_by_id[question_id] = question
+        if option_id is not None:
+            question.add_option(option_id, option_text)
+
+    return surveys
+
+
+async def load_survey_definition(db: AsyncSession, survey_id: int) -> Optional[SurveyDefinition]:
+    return (await load_survey_definitions(db, [survey_id])).get(survey_id)
+
+
+async def _attach_answers(db: AsyncSession, responses: List[ResponseInfo], *criteria) -> None:
+    by_id = {response.id: response for response in responses}
+    answers_result = await db.execute(_answers_statement(*criteria))
+    for response_id, question_id, answer_text, answer_options in answers_result:
+        by_id[response_id].answers.append(AnswerInfo(question_id, answer_text, answer_options))
+
+
+async def load_survey_responses(
+    db: AsyncSession,
+    survey_id: int,
+    with_answers: bool = True,
+    with_employee: bool = True,
+) -> List[ResponseInfo]:
+    """All responses to a survey ordered by id, with answers and employees when requested."""
+    responses = []
+    for row in await db.execute(_survey_responses_statement(survey_id, with_employee)):
+        employee = EmployeeInfo(*row[3:]) if with_employee else None
+        responses.append(ResponseInfo(row[0], row[1], row[2], employee))
+
+    if with_answers and responses:
+        await _attach_answers(db, responses, SurveyResponse.survey_id == survey_id)
+    return responses
+
+
+async def load_employee_responses(db: AsyncSession, employee: EmployeeInfo) -> List[ResponseInfo]:
+    """All responses of an employee ordered by id, with answers."""
+    responses_result = await db.execute(_employee_responses_statement(employee.id))
+    responses = [ResponseInfo(*row, employee) for row in responses_result]
+
+    if responses:
+        await _attach_answers(db, responses, SurveyResponse.employee_id == employee.id)
+    return responses
+
+
+async def load_employee(db: AsyncSession, employee_id: int) -> Optional[EmployeeInfo]:
+    result = await db.execute(select(*_EMPLOYEE_COLUMNS).where(Employee.id == employee_id))
+    row = result.first()
+    return EmployeeInfo(*row) if row else None
+
+
+def build_employee_result(employee: EmployeeInfo) -> EmployeeResult:
+    return EmployeeResult.model_construct(
+        id=employee.id,
+        telegram_id=employee.telegram_id,
+        telegram_username=employee.telegram_username,
+        first_name=employee.first_name,
+        last_name=employee.last_name,
+    )
+
+
+def build_question_results(survey: SurveyDefinition, answers: List[AnswerInfo]) -> List[QuestionResult]:
+    """Answers with question texts and option texts; answers to deleted questions are skipped."""
+    results = []
+    for answer in answers:
+        question = survey.questions_by_id.get(answer.question_id)
+        if question is None:
+            continue
+
+        # Get option texts for choice answers
+        answer_options_texts = None
+        if answer.answer_options:
+            option_texts = question.option_texts
+            answer_options_texts = [
+                option_texts[option_id] for option_id in answer.answer_options if option_id in option_texts
+            ]
+
+        results.append(QuestionResult.model_construct(
+            question_id=answer.question_id,
+            question_text=question.question_text,
+            question_type=question.question_type,
+            answer_text=answer.answer_text,
+            answer_options=answer_options_texts,
+        ))
+    return results
+
+
+def build_response_fields(
+    response: ResponseInfo,
+    survey: SurveyDefinition,
+    employee_result: Optional[EmployeeResult] = None,
+) -> dict:
+    """Field values of a ResponseResult, for full models and sparse fieldsets alike."""
+    return dict(
+        response_id=response.id,
+        survey_id=survey.id,
+        survey_title=survey.title,
+        employee=employee_result,
+        completed_at=response.completed_at,
+        answers=build_question_results(survey, response.answers),
+    )
+
+
+def build_response_result(response: ResponseInfo, survey: SurveyDefinition) -> ResponseResult:
+    return ResponseResult.model_construct(
+        **build_response_fields(response, survey, build_employee_result(response.employee))
+    )
@@ -0,0 +1,251 @@
+"""
+Напоминания о незавершённых опросах.
+
+Для каждого назначенного опроса создаётся задача в reminder_jobs. Пока
+опрос не завершён, напоминание отправляется каждые
+REMINDER_INTERVAL_MINUTES минут, но не более MAX_REMINDER_ATTEMPTS раз.
+
+Ближайшие задачи (на REFILL_SECONDS вперёд) держатся в куче в памяти и
+подгружаются из БД по индексу (status, next_run_at), поэтому таблица
+никогда не читается целиком. Перед отправкой задача захватывается
+условным UPDATE (pending -> sending): отправить её может только один
+обработчик. Задачи, оставшиеся в sending после падения процесса, при
+старте считаются отправленными и переносятся на следующий интервал,
+так что перезапуск не приводит к повторной отправке.
+"""
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bot.services.notification_service import format_reminder
+from app.bot.services.outbox import outbox
+from app.config import settings
+from app.database import async_session, read_session
+from app.models import Employee, ReminderJob, Survey, SurveyResponse
+
+logger = logging.getLogger(__name__)
+
+REMINDER_PENDING = "pending"
+REMINDER_SENDING = "sending"
+REMINDER_DONE = "done"
+REMINDER_CANCELLED = "cancelled"
+
+# Горизонт подгрузки задач в память и период повторной подгрузки
+REFILL_SECONDS = 300
+# Сколько задач захватывать и отправлять за раз
+CLAIM_BATCH_SIZE = 200
+# Первая пауза перед повтором восстановления при старте; удваивается до REFILL_SECONDS
+RECOVER_RETRY_SECONDS = 5
+
+
+def _interval() -> timedelta:
+    return timedelta(minutes=settings.REMINDER_INTERVAL_MINUTES)
+
+
+async def schedule_reminders(db: AsyncSession, response_ids: Iterable[int]) -> None:
+    """Create reminder jobs for new survey responses. The caller commits."""
+    next_run_at = datetime.utcnow() + _interval()
+    rows = [
+        {"response_id": response_id, "status": REMINDER_PENDING, "next_run_at": next_run_at, "attempts": 0}
+        for response_id in response_ids
+    ]
+    if rows:
+        await db.execute(insert(ReminderJob), rows)
+
+
+class ReminderEngine:
+    """Min-heap of due reminder jobs backed by the reminder_jobs table."""
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._queued: Set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Reminder engine started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Shutdown must go on to stop the outbox and dispose the engines
+            logger.error(f"Reminder engine failed: {str(e)}", exc_info=True)
+        self._task = None
+
+    def wake(self) -> None:
+        """Reload due jobs now, e.g. after jobs were scheduled for the near future."""
+        self._wakeup.set()
+
+    async def _loop(self) -> None:
+        await self._recover_with_retry()
+        next_refill = datetime.utcnow()
+        while True:
+            try:
+                now = datetime.utcnow()
+                if now >= next_refill or self._wakeup.is_set():
+                    self._wakeup.clear()
+                    await self._refill(now)
+                    next_refill = now + timedelta(seconds=REFILL_SECONDS)
+
+                due = self._pop_due(now)
+                if due:
+                    for start in range(0, len(due), CLAIM_BATCH_SIZE):
+                        await self._process(due[start:start + CLAIM_BATCH_SIZE])
+                    continue
+            except Exception as e:
+                logger.error(f"Reminder engine error: {str(e)}", exc_info=True)
+
+            wake_at = next_refill
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            timeout = max((wake_at - datetime.utcnow()).total_seconds(), 0.0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _recover_with_retry(self) -> None:
+        """Recover until it succeeds, e.g. while a migration holds the write connection."""
+        delay = RECOVER_RETRY_SECONDS
+        while True:
+            try:
+                await self._recover()
+                return
+            except Exception as e:
+                logger.error(f"Reminder recovery failed, retrying in {delay}s: {str(e)}", exc_info=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, REFILL_SECONDS)
+
+    async def _recover(self) -> None:
+        """Jobs left in 'sending' by a crash may have been delivered: never resend them."""
+        async with async_session() as db:
+            await db.execute(
+                update(ReminderJob)
+                .where(ReminderJob.status == REMINDER_SENDING)
+                .where(ReminderJob.attempts >= settings.MAX_REMINDER_ATTEMPTS)
+                .values(status=REMINDER_DONE)
+            )
+            result = await db.execute(
+                update(ReminderJob)
+                .where(ReminderJob.status == REMINDER_SENDING)
+                .values(status=REMINDER_PENDING, next_run_at=datetime.utcnow() + _interval())
+            )
+            await db.commit()
+            if result.rowcount:
+                logger.warning(f"Rescheduled {result.rowcount} reminders interrupted by a restart")
+
+    async def _refill(self, now: datetime) -> None:
+        """Load pending jobs due within the refill horizon (index range scan)."""
+        horizon = now + timedelta(seconds=REFILL_SECONDS)
+        async with read_session() as db:
+            result = await db.execute(
+                select(ReminderJob.id, ReminderJob.next_run_at)
+                .where(ReminderJob.status == REMINDER_PENDING)
+                .where(ReminderJob.next_run_at <= horizon)
+                .order_by(ReminderJob.next_run_at)
+            )
+            for job_id, next_run_at in result:
+                if job_id not in self._queued:
+                    self._queued.add(job_id)
+                    heapq.heappush(self._heap, (next_run_at, job_id))
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, job_id = heapq.heappop(self._heap)
+            self._queued.discard(job_id)
+            due.append(job_id)
+        return due
+
+    async def _process(self, job_ids: List[int]) -> None:
+        now = datetime.utcnow()
+        async with async_session() as db:
+            # Claim: only rows still pending and due move to 'sending'
+            result = await db.execute(
+                update(ReminderJob)
+                .where(ReminderJob.id.in_(job_ids))
+                .where(ReminderJob.status == REMINDER_PENDING)
+                .where(ReminderJob.next_run_at <= now)
+                .values(status=REMINDER_SENDING, attempts=ReminderJob.attempts + 1)
+                .returning(ReminderJob.id, ReminderJob.attempts)
+            )
+            claimed: Dict[int, int] = dict(result.all())
+            await db.commit()
+            if not claimed:
+                return
+
+            details = await db.execute(
+                select(
+                    ReminderJob.id,
+                    SurveyResponse.status,
+                    Employee.telegram_id,
+                    Employee.is_active,
+                    Survey.title,
+                    Survey.description,
+                    Survey.is_active,
+                )
+                .join(SurveyResponse, SurveyResponse.id == ReminderJob.response_id)
+                .join(Employee, Employee.id == SurveyResponse.employee_id)
+                .join(Survey, Survey.id == SurveyResponse.survey_id)
+                .where(ReminderJob.id.in_(claimed))
+            )
+
+            outcomes: Dict[int, Tuple[str, Optional[str]]] = {}
+            sends = {}
+            for job_id, response_status, telegram_id, employee_active, title, description, survey_active in details:
+                if response_status == "completed" or not employee_active or not survey_active:
+                    outcomes[job_id] = (REMINDER_CANCELLED, None)
+                else:
+                    sends[job_id] = outbox.send(telegram_id, format_reminder(title, description))
+            # Responses deleted in the meantime
+            for job_id in claimed:
+                if job_id not in outcomes and job_id not in sends:
+                    outcomes[job_id] = (REMINDER_CANCELLED, None)
+
+            # Release the write connection while messages are sent
+            await db.commit()
+
+            # Sends share the outbox rate limit
+            results = await asyncio.gather(*sends.values())
+            next_run_at = datetime.utcnow() + _interval()
+            for job_id, send_result in zip(sends, results):
+                error = None if send_result["success"] else send_result.get("error")
+                if claimed[job_id] >= settings.MAX_REMINDER_ATTEMPTS:
+                    outcomes[job_id] = (REMINDER_DONE, error)
+                else:
+                    outcomes[job_id] = (REMINDER_PENDING, error)
+
+            # Bulk UPDATE by primary key
+            await db.execute(
+                update(ReminderJob),
+                [
+                    {"id": job_id, "status": job_status, "next_run_at": next_run_at, "last_error": error}
+                    for job_id, (job_status, error) in outcomes.items()
+                ],
+            )
+            await db.commit()
+
+        sent = sum(1 for result in results if result["success"])
+        logger.info(f"Reminders processed: {len(claimed)} claimed, {sent} sent")
+
+        if _interval() <= timedelta(seconds=REFILL_SECONDS):
+            # The next attempt is due before the next refill
+            for job_id, (job_status, _) in outcomes.items():
+                if job_status == REMINDER_PENDING and job_id not in self._queued:
+                    self._queued.add(job_id)
+                    heapq.heappush(self._heap, (next_run_at, job_id))
+
+
+reminder_engine = ReminderEngine()
@@ -0,0 +1,52 @@
+"""
+Пул процессов для тяжёлых отчётов (выгрузки, аналитика).
+
+CPU-ёмкая работа выносится из event loop, который также обслуживает
+polling Telegram и хендлеры бота. Функции, передаваемые в пул, должны быть
+объявлены на уровне модуля и принимать только picklable-аргументы.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def start_report_pool() -> Optional[ProcessPoolExecutor]:
+    """Create the report executor sized by REPORT_POOL_WORKERS (0 disables the pool)."""
+    global _executor
+    if _executor is None and settings.REPORT_POOL_WORKERS > 0:
+        # spawn: workers must not inherit the bot session and event loop of the parent
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.REPORT_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Report pool started with {settings.REPORT_POOL_WORKERS} workers")
+    return _executor
+
+
+def shutdown_report_pool() -> None:
+    """Stop the report executor, cancelling jobs that have not started yet."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_report_job(func: Callable[..., Any], *args) -> Any:
+    """
+    Run a CPU-bound report function off the event loop.
+
+    Uses the process pool when enabled, otherwise falls back to a thread.
+    """
+    executor = start_report_pool()
+    if executor is None:
+        return await asyncio.to_thread(func, *args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
@@ -0,0 +1,135 @@
+"""
+Автоматическая рассылка опросов по сроку работы.
+
+Раз в день планировщик находит сотрудников, у которых с прошлого запуска
+наступил срок опроса (start_date + days_after_start), создаёт для них
+ответы pending и ставит приглашения в очередь отправки. Для каждого опроса
+хранится дата последнего обработанного дня (survey_dispatch_state), поэтому
+каждый запуск читает по индексу start_date только новый интервал, а не всю
+таблицу сотрудников. После простоя пропущенные дни обрабатываются при
+следующем запуске.
+
+Сотрудники, добавленные задним числом (срок уже прошёл до последнего
+запуска), автоматически не попадают в рассылку: для них есть массовое
+назначение POST /bot/initiate-survey/bulk.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import async_session
+from app.models import Employee, Survey, SurveyDispatchState
+from app.services.assignments import bulk_assign_survey, enqueue_survey_invites
+
+logger = logging.getLogger(__name__)
+
+
+async def dispatch_due_surveys(today: Optional[date] = None) -> dict:
+    """
+    Assign every active survey to employees whose threshold date fell in (last run, today].
+
+    Each survey is committed separately together with its watermark.
+    Returns {survey_id: number of responses created}.
+    """
+    today = today or date.today()
+    created = {}
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(
+                Survey.id,
+                Survey.title,
+                Survey.description,
+                Survey.days_after_start,
+                Survey.created_at,
+                SurveyDispatchState.last_run_date,
+            )
+            .outerjoin(SurveyDispatchState, SurveyDispatchState.survey_id == Survey.id)
+            .where(Survey.is_active == True)
+        )
+        for survey in result.all():
+            last_run_date = survey.last_run_date
+            if last_run_date is None:
+                # New survey: only employees reaching the threshold from its creation day on
+                created_on = survey.created_at.date() if survey.created_at else today
+                last_run_date = created_on - timedelta(days=1)
+            if last_run_date >= today:
+                continue
+
+            days = timedelta(days=survey.days_after_start or 0)
+            try:
+                employee_ids = await bulk_assign_survey(
+                    db,
+                    survey.id,
+                    Employee.start_date > last_run_date - days,
+                    Employee.start_date <= today - days,
+                    Employee.is_active == True,
+                )
+                await db.merge(SurveyDispatchState(survey_id=survey.id, last_run_date=today))
+                await db.commit()
+            except Exception as e:
+                # The watermark is not moved, the window is retried on the next run
+                logger.error(f"Dispatch of survey {survey.id} failed: {str(e)}", exc_info=True)
+                await db.rollback()
+                continue
+
+            created[survey.id] = len(employee_ids)
+            if employee_ids:
+                queued = await enqueue_survey_invites(survey, employee_ids)
+                logger.info(
+                    f"Survey '{survey.title}' dispatched to {len(employee_ids)} employees, "
+                    f"{queued} invites queued"
+                )
+
+    return created
+
+
+def _parse_run_at(value: str) -> time:
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+class DispatchScheduler:
+    """Runs dispatch_due_surveys on startup (catch-up) and then daily at run_at."""
+
+    def __init__(self, run_at: str):
+        self.run_at = _parse_run_at(run_at)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Survey dispatch scheduler started, daily at {self.run_at:%H:%M}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now()
+        next_run = datetime.combine(now.date(), self.run_at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                created = await dispatch_due_surveys()
+                if created:
+                    logger.info(f"Survey dispatch finished: {created}")
+            except Exception as e:
+                logger.error(f"Survey dispatch failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self._seconds_until_next_run())
+
+
+scheduler = DispatchScheduler(settings.SCHEDULER_RUN_AT)
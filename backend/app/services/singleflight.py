@@ -0,0 +1,62 @@
+"""
+Объединение одинаковых одновременных запросов (single-flight).
+
+Когда несколько HR одновременно открывают один и тот же опрос, результаты,
+аналитика и выгрузка вычисляются один раз: первый запрос запускает
+вычисление, остальные ждут его результат. Ключ включает версию данных,
+поэтому общий результат всегда соответствует текущему состоянию опроса.
+Готовые результаты можно дополнительно держать в коротком TTL-кэше.
+
+Вычисление выполняется в отдельной задаче и открывает собственную сессию
+БД: отключение клиента, запустившего его, не прерывает остальных.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.config import settings
+from app.services.cache import MISSING, TTLCache
+
+
+class SingleFlight:
+    """Shares one in-flight computation per key, optionally caching results for ttl seconds."""
+
+    def __init__(self, ttl: float = 0, max_size: int = 32):
+        self._results = TTLCache(ttl, max_size)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]], cache: bool = True) -> Any:
+        """Return func()'s result, joining a running computation for the same key."""
+        if cache:
+            cached = self._results.get(key)
+            if cached is not MISSING:
+                return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, cache))
+        # A cancelled caller must not cancel the computation others are waiting for
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task, cache: bool) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            # Errors are not cached: the next request retries
+            return
+        if cache:
+            self._results.set(key, task.result())
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    async def shutdown(self) -> None:
+        """Cancel computations that are still running."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+single_flight = SingleFlight(ttl=settings.RESULTS_CACHE_TTL_SECONDS)
@@ -0,0 +1,46 @@
+"""
+Массовое создание вопросов опроса.
+
+Вопросы вставляются многострочным INSERT ... RETURNING, затем все варианты
+ответов одним executemany. Число обращений к БД не зависит от количества
+вопросов. Используется при создании опроса через API и скриптами
+инициализации шаблонов.
+"""
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Question, QuestionOption
+
+
+async def insert_questions(db: AsyncSession, survey_id: int, questions: List[dict]) -> List[int]:
+    """
+    Insert questions with their options for a survey; returns the new question ids in order.
+
+    Each question is a dict of Question columns with an optional "options" list
+    of dicts with option_text and order_index. The caller commits.
+    """
+    if not questions:
+        return []
+
+    question_rows = []
+    for question in questions:
+        row = {key: value for key, value in question.items() if key != "options"}
+        question_rows.append({"survey_id": survey_id, **row})
+
+    # sort_by_parameter_order would fall back to one INSERT per row on SQLite.
+    # Rows of a multi-row INSERT get increasing rowids in VALUES order, so the
+    # sorted ids line up with question_rows even though RETURNING is unordered.
+    result = await db.execute(insert(Question).returning(Question.id), question_rows)
+    question_ids = sorted(result.scalars().all())
+
+    option_rows = [
+        {"question_id": question_id, **option}
+        for question_id, question in zip(question_ids, questions)
+        for option in question.get("options") or []
+    ]
+    if option_rows:
+        await db.execute(insert(QuestionOption), option_rows)
+
+    return question_ids
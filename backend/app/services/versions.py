@@ -0,0 +1,95 @@
+"""
+Версии данных опроса.
+
+Версия меняется при любом изменении, влияющем на результаты опроса:
+редактирование опроса, новые ответы, завершение прохождения, удаление
+ответов или изменение данных сотрудников. По ней строятся ключи кэша
+и ETag. Каждая версия вычисляется одним запросом.
+"""
+import hashlib
+from typing import Optional
+
+from sqlalchemy import String, cast, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Survey, Question, SurveyResponse, Answer, Employee
+
+
+def _hash(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+
+def _definition_version_columns():
+    """
+    update_survey stamps Survey.updated_at with microseconds; the max question
+    id also covers questions added outside the API (e.g. by scripts).
+    """
+    return [
+        Survey.updated_at,
+        select(func.max(Question.id))
+        .where(Question.survey_id == Survey.id)
+        .scalar_subquery(),
+    ]
+
+
+def _data_version_columns():
+    """Scalar subqueries over the survey's responses, answers and respondents."""
+    responses = select(SurveyResponse.id).where(SurveyResponse.survey_id == Survey.id)
+    return [
+        *_definition_version_columns(),
+        select(func.count(SurveyResponse.id))
+        .where(SurveyResponse.survey_id == Survey.id)
+        .scalar_subquery(),
+        select(func.max(SurveyResponse.completed_at))
+        .where(SurveyResponse.survey_id == Survey.id)
+        .scalar_subquery(),
+        select(func.max(Answer.id))
+        .where(Answer.response_id.in_(responses))
+        .scalar_subquery(),
+        select(func.max(Employee.updated_at))
+        .join(SurveyResponse, SurveyResponse.employee_id == Employee.id)
+        .where(SurveyResponse.survey_id == Survey.id)
+        .scalar_subquery(),
+    ]
+
+
+async def get_survey_definition_version(db: AsyncSession, survey_id: int) -> Optional[str]:
+    """Version of the survey itself (fields, questions, options), or None if it does not exist."""
+    result = await db.execute(select(*_definition_version_columns()).where(Survey.id == survey_id))
+    row = result.first()
+    if row is None:
+        return None
+    return _hash(survey_id, *row)
+
+
+async def get_survey_data_version(db: AsyncSession, survey_id: int) -> Optional[str]:
+    """Return an opaque version token for survey results, or None if the survey does not exist."""
+    result = await db.execute(select(*_data_version_columns()).where(Survey.id == survey_id))
+    row = result.first()
+    if row is None:
+        return None
+    return _hash(survey_id, *row)
+
+
+async def get_survey_results_version(db: AsyncSession, survey_id: int) -> Optional[str]:
+    """
+    Data version plus the eligible employees count, which drives completion_rate.
+
+    The eligibility cutoff moves daily, so the current date is part of the version.
+    """
+    # SQLite date arithmetic, same cutoff as the results endpoints compute in Python
+    cutoff = func.date("now", "localtime", "-" + cast(Survey.days_after_start, String) + " days")
+    eligible = (
+        select(func.count(Employee.id))
+        .where(Employee.start_date <= cutoff)
+        .where(Employee.is_active == True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(*_data_version_columns(), eligible, func.date("now", "localtime"))
+        .where(Survey.id == survey_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return _hash(survey_id, *row)
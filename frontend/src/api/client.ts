@@ -11,7 +11,7 @@ export const api = axios.create({
 
 // Surveys API
 export const surveysApi = {
-  getAll: (params?: { skip?: number; limit?: number; active_only?: boolean }) =>
+  getAll: (params?: { skip?: number; limit?: number; after_id?: number; active_only?: boolean; view?: 'full' | 'summary'; fields?: string }) =>
     api.get('/surveys', { params }),
 
   getById: (id: number) =>
@@ -26,8 +26,8 @@ export const surveysApi = {
   delete: (id: number) =>
     api.delete(`/surveys/${id}`),
 
-  getResults: (id: number) =>
-    api.get(`/responses/surveys/${id}/results`),
+  getResults: (id: number, params?: { fields?: string }) =>
+    api.get(`/responses/surveys/${id}/results`, { params }),
 
   exportResults: (id: number) =>
     api.get(`/responses/surveys/${id}/results/export`, {
@@ -39,11 +39,14 @@ export const surveysApi = {
 
   detachAll: (id: number) =>
     api.delete(`/responses/surveys/${id}/detach`),
+
+  getDetachJob: (jobId: string) =>
+    api.get(`/responses/detach-jobs/${jobId}`),
 }
 
 // Employees API
 export const employeesApi = {
-  getAll: (params?: { skip?: number; limit?: number }) =>
+  getAll: (params?: { skip?: number; limit?: number; after_id?: number; fields?: string }) =>
     api.get('/employees', { params }),
 
   getById: (id: number) =>
@@ -67,7 +70,7 @@ export const employeesApi = {
 
 // Responses API
 export const responsesApi = {
-  getAll: (params?: { skip?: number; limit?: number; survey_id?: number }) =>
+  getAll: (params?: { skip?: number; limit?: number; after_id?: number; survey_id?: number; view?: 'full' | 'summary'; fields?: string }) =>
     api.get('/responses', { params }),
 
   getById: (id: number) =>
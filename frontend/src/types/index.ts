@@ -30,6 +30,11 @@ export interface QuestionCreate {
   options?: { option_text: string; order_index: number }[]
 }
 
+export interface QuestionUpdate extends Omit<QuestionCreate, 'options'> {
+  id?: number  // Omit for a new question
+  options?: { id?: number; option_text: string; order_index: number }[]
+}
+
 // Survey types
 export interface Survey {
   id: number
@@ -55,11 +60,23 @@ export interface SurveyUpdate {
   description?: string
   days_after_start?: number
   is_active?: boolean
+  questions?: QuestionUpdate[]
+}
+
+export interface SurveySummary extends Omit<Survey, 'questions'> {
+  questions_count: number
 }
 
 export interface SurveysListResponse {
   surveys: Survey[]
   total: number
+  next_after_id: number | null
+}
+
+export interface SurveySummaryListResponse {
+  surveys: SurveySummary[]
+  total: number
+  next_after_id: number | null
 }
 
 // Employee types
@@ -136,9 +153,21 @@ export interface SurveyResponse {
   employee: Employee
 }
 
+export interface SurveyResponseSummary extends Omit<SurveyResponse, 'answers'> {
+  started_at: string
+  answers_count: number
+}
+
 export interface ResponsesListResponse {
   responses: SurveyResponse[]
   total: number
+  next_after_id: number | null
+}
+
+export interface ResponseSummaryListResponse {
+  responses: SurveyResponseSummary[]
+  total: number
+  next_after_id: number | null
 }
 
 // Survey Results
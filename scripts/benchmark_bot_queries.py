@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bot hot-path queries.
+
+Compares the per-update queries as handlers used to build them (a new ORM
+select() per call, entities with selectinload) with the prebuilt statements
+in app.bot.queries. Uses an employee with an open response from the
+configured database; run after seeding or on a copy of production data.
+
+Usage:
+    python scripts/benchmark_bot_queries.py                  # 2000 iterations
+    python scripts/benchmark_bot_queries.py --iterations 500
+"""
+import asyncio
+import sys
+import os
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+# Change to backend directory so DATABASE_URL works correctly
+os.chdir(backend_dir)
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.config import settings
+from app.database import dispose_engines, read_session
+from app.bot import queries
+from app.models import Employee, Question, Survey, SurveyResponse
+
+OPEN_STATUSES = ["pending", "in_progress"]
+WARMUP = 100
+
+
+async def orm_employee(db, telegram_id, survey_id, employee_id):
+    result = await db.execute(select(Employee).where(Employee.telegram_id == telegram_id))
+    return result.scalar_one_or_none()
+
+
+async def orm_open_response(db, telegram_id, survey_id, employee_id):
+    result = await db.execute(
+        select(SurveyResponse).where(
+            SurveyResponse.survey_id == survey_id,
+            SurveyResponse.employee_id == employee_id,
+            SurveyResponse.status.in_(OPEN_STATUSES),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def orm_survey_questions(db, telegram_id, survey_id, employee_id):
+    result = await db.execute(
+        select(Survey)
+        .where(Survey.id == survey_id)
+        .options(selectinload(Survey.questions).selectinload(Question.options))
+    )
+    return result.scalar_one_or_none().questions
+
+
+async def compiled_employee(db, telegram_id, survey_id, employee_id):
+    return await queries.get_employee_by_telegram_id(db, telegram_id)
+
+
+async def compiled_open_response(db, telegram_id, survey_id, employee_id):
+    return await queries.get_open_response(db, survey_id, employee_id)
+
+
+async def compiled_survey_questions(db, telegram_id, survey_id, employee_id):
+    return await queries.get_survey_questions(db, survey_id)
+
+
+BENCHMARKS = [
+    ("Employee by telegram_id", orm_employee, compiled_employee),
+    ("Open response", orm_open_response, compiled_open_response),
+    ("Survey questions with options", orm_survey_questions, compiled_survey_questions),
+]
+
+
+async def measure(func, args, iterations: int) -> tuple:
+    """Mean wall and CPU time per call in microseconds; a fresh session per call, like a handler."""
+    for _ in range(WARMUP):
+        async with read_session() as db:
+            await func(db, *args)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        async with read_session() as db:
+            await func(db, *args)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return wall / iterations * 1e6, cpu / iterations * 1e6
+
+
+async def main():
+    iterations = 2000
+    if "--iterations" in sys.argv:
+        iterations = int(sys.argv[sys.argv.index("--iterations") + 1])
+    print(f"Benchmarking bot queries: {settings.DATABASE_URL}, {iterations} iterations\n")
+
+    try:
+        async with read_session() as db:
+            result = await db.execute(
+                select(Employee.telegram_id, SurveyResponse.survey_id, SurveyResponse.employee_id)
+                .join(SurveyResponse, SurveyResponse.employee_id == Employee.id)
+                .where(SurveyResponse.status.in_(OPEN_STATUSES))
+                .limit(1)
+            )
+            sample = result.first()
+        if sample is None:
+            print("✗ No employee with an open response found. Assign a survey first.")
+            sys.exit(1)
+
+        print(f"{'query':<32}{'orm µs':>10}{'compiled µs':>14}{'wall':>8}{'cpu':>8}")
+        for description, orm_func, compiled_func in BENCHMARKS:
+            orm_wall, orm_cpu = await measure(orm_func, tuple(sample), iterations)
+            compiled_wall, compiled_cpu = await measure(compiled_func, tuple(sample), iterations)
+            print(
+                f"{description:<32}{orm_wall:>10.0f}{compiled_wall:>14.0f}"
+                f"{orm_wall / compiled_wall:>7.1f}x{orm_cpu / compiled_cpu:>7.1f}x"
+            )
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Check that hot queries use their indexes.
+
+Runs EXPLAIN QUERY PLAN for the queries issued by bot handlers, results,
+analytics and deletes, and fails if a plan doesn't use the expected index.
+Bot, results and analytics statements are imported from the modules that run
+them (app.bot.queries, app.services.read_models, app.services.analytics), so
+the check follows their changes; the rest are written out here.
+Run after migrations (python scripts/migrate.py).
+
+Usage:
+    python scripts/check_query_plans.py            # check
+    python scripts/check_query_plans.py --verbose  # also print every plan
+"""
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+# Change to backend directory so DATABASE_URL works correctly
+os.chdir(backend_dir)
+
+from sqlalchemy import select, delete
+from app.bot import queries
+from app.config import settings
+from app.database import dispose_engines, engine
+from app.models import Answer, Employee, SurveyResponse
+from app.services import analytics, read_models
+
+# (description, statement, bind parameter values, index or indexes that the plan must use)
+HOT_QUERIES = [
+    (
+        "Employee by Telegram id (bot handlers)",
+        queries._EMPLOYEE_BY_TELEGRAM_ID,
+        {"telegram_id": 1},
+        "ix_employees_telegram_id",
+    ),
+    (
+        "Open surveys of an employee (main menu, /start)",
+        queries._OPEN_SURVEYS,
+        {"employee_id": 1},
+        "ix_survey_responses_employee_id_status",
+    ),
+    (
+        "Open responses count of an employee (main menu)",
+        queries._OPEN_RESPONSES_COUNT,
+        {"employee_id": 1},
+        "ix_survey_responses_employee_id_status",
+    ),
+    (
+        "Open response for a survey and employee (survey handler)",
+        queries._OPEN_RESPONSE,
+        {"survey_id": 1, "employee_id": 1},
+        "ix_survey_responses_survey_id_employee_id_status",
+    ),
+    (
+        "Questions and options of a survey (survey handler)",
+        queries._SURVEY_QUESTIONS,
+        {"survey_id": 1},
+        ("ix_questions_survey_id", "ix_question_options_question_id"),
+    ),
+    (
+        "Questions and options of a survey (results, analytics)",
+        read_models._questions_statement([1]),
+        {},
+        ("ix_questions_survey_id", "ix_question_options_question_id"),
+    ),
+    (
+        "Responses of a survey (results)",
+        read_models._survey_responses_statement(1, with_employee=True),
+        {},
+        "ix_survey_responses_survey_id_employee_id_status",
+    ),
+    (
+        "Answers of a survey (results)",
+        read_models._answers_statement(SurveyResponse.survey_id == 1),
+        {},
+        "ix_answers_response_id",
+    ),
+    (
+        "Responses of an employee (employee results)",
+        read_models._employee_responses_statement(1),
+        {},
+        "ix_survey_responses_employee_id_status",
+    ),
+    (
+        "Answers of an employee (employee results)",
+        read_models._answers_statement(SurveyResponse.employee_id == 1),
+        {},
+        "ix_answers_response_id",
+    ),
+    (
+        "Responses count (analytics cross-filter)",
+        analytics._count_responses_statement(1, [1]),
+        {},
+        "ix_answer_selected_options_option_id_answer_id",
+    ),
+    (
+        "Answers per question (analytics)",
+        analytics._answer_totals_statement(1),
+        {},
+        "ix_answers_response_id",
+    ),
+    (
+        "Option counts of a survey (analytics)",
+        analytics._option_counts_statement(1, [1, 2, 3]),
+        {},
+        "ix_answer_selected_options_option_id_answer_id",
+    ),
+    (
+        "Option counts with a cross-filter (analytics)",
+        analytics._option_counts_statement(1, [1, 2, 3], [1]),
+        {},
+        "ix_answer_selected_options_option_id_answer_id",
+    ),
+    (
+        "Text responses of a survey (analytics)",
+        analytics._text_responses_statement(1, [1]),
+        {},
+        "ix_answers_question_id",
+    ),
+    (
+        "Existing response check (assignment anti-join)",
+        select(Employee.id).where(
+            ~select(SurveyResponse.id)
+            .where(SurveyResponse.survey_id == 1, SurveyResponse.employee_id == Employee.id)
+            .exists()
+        ),
+        {},
+        "ix_survey_responses_survey_id_employee_id_status",
+    ),
+    (
+        "Pending responses of a survey (reminders)",
+        select(SurveyResponse.id).where(
+            SurveyResponse.survey_id == 1,
+            SurveyResponse.status == "pending",
+        ),
+        {},
+        "ix_survey_responses_survey_id_employee_id_status",
+    ),
+    (
+        "Answers to a question (cascade on question delete)",
+        select(Answer.id).where(Answer.question_id == 1),
+        {},
+        "ix_answers_question_id",
+    ),
+    (
+        "Chunked detach",
+        delete(SurveyResponse).where(
+            SurveyResponse.id.in_(
+                select(SurveyResponse.id).where(SurveyResponse.survey_id == 1).limit(200)
+            )
+        ),
+        {},
+        "ix_survey_responses_survey_id_employee_id_status",
+    ),
+]
+
+
+async def explain(conn, statement, params: dict) -> list:
+    # Compile the statement as the application runs it: with bound parameters,
+    # expanding IN lists into placeholders
+    if params:
+        statement = statement.params(params)
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    values = compiled.construct_params()
+    args = tuple(values[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", args)
+    return [row[-1] for row in result]
+
+
+async def main():
+    verbose = "--verbose" in sys.argv[1:]
+    print(f"Checking query plans: {settings.DATABASE_URL}\n")
+
+    failed = 0
+    async with engine.connect() as conn:
+        for description, statement, params, indexes in HOT_QUERIES:
+            if isinstance(indexes, str):
+                indexes = (indexes,)
+            plan = await explain(conn, statement, params)
+            ok = all(any(index in step for step in plan) for index in indexes)
+            failed += not ok
+            print(f"{'✓' if ok else '✗'} {description}: {', '.join(indexes)}")
+            if verbose or not ok:
+                for step in plan:
+                    print(f"      {step}")
+    await dispose_engines()
+
+    if failed:
+        print(f"\n✗ {failed} queries don't use their index. Run: python scripts/migrate.py")
+        sys.exit(1)
+    print("\n✓ All hot queries use their indexes.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,7 +11,7 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent / "backend"
 sys.path.insert(0, str(backend_dir))
 
-from app.database import init_db
+from app.database import dispose_engines, init_db
 from app.config import settings
 # Import all models to register them with Base
 from app.models import Employee, Survey, Question, QuestionOption, SurveyResponse, Answer
@@ -21,6 +21,7 @@ async def main():
     """Initialize database tables."""
     print(f"Initializing database at: {settings.DATABASE_URL}")
     await init_db()
+    await dispose_engines()
     print("Database initialized successfully!")
     print("\nTables created:")
     print("  - employees")
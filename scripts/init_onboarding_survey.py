@@ -15,8 +15,9 @@ sys.path.insert(0, str(backend_dir))
 # Change to backend directory so DATABASE_URL works correctly
 os.chdir(backend_dir)
 
-from app.database import async_session
-from app.models import Survey, Question, QuestionOption
+from app.database import async_session, dispose_engines
+from app.models import Survey
+from app.services.survey_builder import insert_questions
 from sqlalchemy import select
 
 
@@ -104,29 +105,23 @@ async def init_onboarding_survey():
             {"order": 5, "text": "5"},
         ]
 
-        # Create questions
-        for q_data in questions_data:
-            question = Question(
-                survey_id=survey.id,
-                question_text=q_data["text_ru"],  # Using RU as default
-                question_text_ru=q_data["text_ru"],
-                question_text_kg=q_data["text_kg"],
-                question_type=q_data["type"],
-                order_index=q_data["order"],
-                is_required=True
-            )
-            db.add(question)
-            await db.flush()  # Get the question ID
-
-            # Add options for single_choice questions
-            if q_data["type"] == "single_choice":
-                for opt_data in rating_options:
-                    option = QuestionOption(
-                        question_id=question.id,
-                        option_text=opt_data["text"],
-                        order_index=opt_data["order"]
-                    )
-                    db.add(option)
+        # Create questions and options in two bulk statements
+        await insert_questions(db, survey.id, [
+            {
+                "question_text": q_data["text_ru"],  # Using RU as default
+                "question_text_ru": q_data["text_ru"],
+                "question_text_kg": q_data["text_kg"],
+                "question_type": q_data["type"],
+                "order_index": q_data["order"],
+                "is_required": True,
+                # Add options for single_choice questions
+                "options": [
+                    {"option_text": opt_data["text"], "order_index": opt_data["order"]}
+                    for opt_data in rating_options
+                ] if q_data["type"] == "single_choice" else [],
+            }
+            for q_data in questions_data
+        ])
 
         await db.commit()
         print("✓ Onboarding survey created successfully!")
@@ -138,6 +133,7 @@ async def main():
     """Initialize the onboarding survey."""
     print("Initializing onboarding survey...")
     await init_onboarding_survey()
+    await dispose_engines()
     print("\nNext steps:")
     print("  1. Start the bot: python -m app.bot.main")
     print("  2. The survey will be available to all employees")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Apply pending database migrations.
+
+Usage:
+    python scripts/migrate.py           # apply pending migrations
+    python scripts/migrate.py --status  # list migrations and whether they are applied
+"""
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+# Change to backend directory so DATABASE_URL works correctly
+os.chdir(backend_dir)
+
+from app.config import settings
+from app.database import dispose_engines, engine, init_db
+from app.migrations import MIGRATIONS, get_applied_versions, run_migrations
+# Import all models to register them with Base
+import app.models  # noqa: F401
+
+
+async def status():
+    """Print every migration with its state."""
+    applied = set(await get_applied_versions(engine))
+    for migration in MIGRATIONS:
+        mark = "✓" if migration.version in applied else " "
+        print(f"  [{mark}] {migration.version:>3}  {migration.name}")
+
+
+async def migrate():
+    """Create missing tables, then apply pending migrations."""
+    print(f"Migrating database: {settings.DATABASE_URL}")
+    await init_db()
+    done = await run_migrations(engine, MIGRATIONS)
+    if done:
+        for migration in done:
+            print(f"✓ Applied {migration.version}: {migration.name}")
+    else:
+        print("✓ Database is up to date.")
+
+
+async def main():
+    try:
+        if "--status" in sys.argv[1:]:
+            await status()
+        else:
+            await migrate()
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())